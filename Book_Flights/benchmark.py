@@ -0,0 +1,308 @@
+# 📊 Flight Booking benchmarks
+#
+# Usage:
+#   python benchmark.py            # run all benchmarks
+#   python benchmark.py search     # run one benchmark by name
+
+import random
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from book_flight import Aircraft, Flight, FlightSystem, Seat, SeatType
+from schedule_import import build_flights, default_templates, import_schedule, paused_gc, read_rows, write_schedule
+
+AIRPORTS = ["DEL", "BOM", "BLR", "MAA", "CCU", "HYD", "AMD", "PNQ", "GOI", "COK",
+            "JAI", "LKO", "PAT", "IXC", "SXR", "GAU", "BBI", "NAG", "IDR", "VNS"]
+
+# ------------------ HELPERS ------------------
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6  # microseconds per call
+
+def traced_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def build_aircraft(aircraft_id, rows=30, seats_per_row=6):
+    """A320-style cabin: exit rows 12-13, extra legroom rows 1-3."""
+    aircraft = Aircraft(aircraft_id)
+    for row in range(1, rows + 1):
+        seat_type = SeatType.EMERGENCY_EXIT if row in (12, 13) else SeatType.EXTRA_LEGROOM if row <= 3 else SeatType.REGULAR
+        for letter in "ABCDEF"[:seats_per_row]:
+            aircraft.add_seat(Seat(f"{row}{letter}", seat_type))
+    return aircraft
+
+def generate_schedule(n_flights, days=365, seed=1, airports=AIRPORTS):
+    """Yields (flight_id, date, start, end, src, dst) rows for a random domestic network."""
+    rng = random.Random(seed)
+    first_day = datetime(2025, 1, 1)
+    for i in range(n_flights):
+        src, dst = rng.sample(airports, 2)
+        departure = rng.randrange(5 * 60, 23 * 60)
+        arrival = (departure + rng.randrange(60, 180)) % (24 * 60)
+        yield (f"F{i}", first_day + timedelta(days=rng.randrange(days)),
+               f"{departure // 60:02d}:{departure % 60:02d}", f"{arrival // 60:02d}:{arrival % 60:02d}", src, dst)
+
+# ------------------ BENCHMARKS ------------------
+def bench_search(n_flights=1_000_000, queries=200):
+    """fetch_flights on 1M scheduled flights: linear filter vs (src, dst, date) route index."""
+    print(f"== Route search: {n_flights:,} scheduled flights ==")
+    aircraft = Aircraft("A320")  # shared: this benchmark is about search, not seats
+    system = FlightSystem()
+    started = time.perf_counter()
+    for flight_id, date, start, end, src, dst in generate_schedule(n_flights):
+        system.add_flight(Flight(flight_id, date, aircraft, start, end, src, dst))
+    print(f"loaded + indexed in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(2)
+    probes = [(*rng.sample(AIRPORTS, 2), datetime(2025, 1, 1) + timedelta(days=rng.randrange(365)))
+              for _ in range(queries)]
+    flights = list(system.flights.values())
+
+    def linear():
+        src, dst, date = rng.choice(probes)
+        return [f for f in flights if f.src == src and f.dst == dst and f.date.date() == date.date()]
+
+    def indexed():
+        return system.fetch_flights(*rng.choice(probes))
+
+    def window():
+        return system.fetch_flights(*rng.choice(probes), depart_after="09:00", depart_before="12:00")
+
+    victims = rng.sample(flights, 1000)
+    started = time.perf_counter()
+    for flight in victims:
+        system.cancel_flight(flight)
+    cancel_us = (time.perf_counter() - started) / len(victims) * 1e6
+
+    print(f"linear filter   {timed(linear, 5):>12,.1f} us/search")
+    print(f"route index     {timed(indexed, queries):>12,.1f} us/search")
+    print(f"09:00-12:00     {timed(window, queries):>12,.1f} us/search (bisect window)")
+    print(f"cancel_flight   {cancel_us:>12,.1f} us")
+
+def bench_connections(flights_per_day=100_000, days=2, n_airports=300, queries=50):
+    """Multi-leg connection search (connection scan) on a 100k-flights-per-day schedule."""
+    print(f"== Connection search: {flights_per_day:,} flights/day x {days} days, {n_airports} airports ==")
+    airports = AIRPORTS + [f"X{i:03d}" for i in range(n_airports - len(AIRPORTS))]
+    aircraft = Aircraft("A320")
+    system = FlightSystem()
+    for flight_id, date, start, end, src, dst in generate_schedule(flights_per_day * days, days, 4, airports):
+        system.add_flight(Flight(flight_id, date, aircraft, start, end, src, dst))
+
+    rng = random.Random(5)
+    latencies, found, legs = [], 0, 0
+    for _ in range(queries):
+        src, dst = rng.sample(airports, 2)
+        started = time.perf_counter()
+        itineraries = system.find_itineraries(src, dst, datetime(2025, 1, 1, rng.randrange(5, 12)), max_legs=3)
+        latencies.append((time.perf_counter() - started) * 1e3)
+        if itineraries:
+            found += 1
+            legs += itineraries[-1].num_legs
+    latencies.sort()
+    print(f"latency ms: p50={latencies[len(latencies) // 2]:.1f} p90={latencies[int(len(latencies) * 0.9)]:.1f} "
+          f"max={latencies[-1]:.1f}; {found}/{queries} routed, avg {legs / max(found, 1):.1f} legs (earliest arrival)")
+
+    started = time.perf_counter()
+    for _ in range(queries):
+        src, dst = rng.sample(airports, 2)
+        system.earliest_arrival(src, dst, datetime(2025, 1, 1, rng.randrange(5, 12)))
+    print(f"earliest_arrival only: {(time.perf_counter() - started) / queries * 1e3:.1f} ms avg")
+
+    extra = Flight("EXTRA", datetime(2025, 1, 1), aircraft, "12:00", "13:00", airports[0], airports[1])
+    update_us = timed(lambda: (system.add_flight(extra), system.cancel_flight(extra)), 1000)
+    print(f"incremental add+cancel: {update_us:.1f} us")
+
+def bench_inventory_memory(sample=2_000, departures_per_day=3_000, load_factor=0.8):
+    """Seat memory for a year of departures: aircraft-per-flight Seat objects vs shared SeatMap + inventory."""
+    flights_per_year = departures_per_day * 365
+    print(f"== Seat inventory memory: {departures_per_day:,} departures/day -> {flights_per_year:,} flights/year ==")
+    date = datetime(2025, 1, 1)
+    shared_aircraft = build_aircraft("VT-A320")
+    seat_ids = list(shared_aircraft.seats)
+    booked = seat_ids[:int(len(seat_ids) * load_factor)]
+
+    def legacy():
+        # Before: a private Aircraft (180 Seat objects) per flight to keep bookings apart
+        return [Flight(f"F{i}", date, build_aircraft(f"A{i}"), "10:00", "12:00", "DEL", "BLR") for i in range(sample)]
+
+    def shared(book):
+        flights = [Flight(f"F{i}", date, shared_aircraft, "10:00", "12:00", "DEL", "BLR") for i in range(sample)]
+        for flight in flights:
+            flight.inventory  # materialize the (empty) inventory
+            for seat_id in (booked if book else ()):
+                flight.book_seat(seat_id, "cust")
+        return flights
+
+    rows = [("aircraft per flight", traced_bytes(legacy)),
+            ("shared map, empty", traced_bytes(lambda: shared(False))),
+            (f"shared map, {load_factor:.0%} sold", traced_bytes(lambda: shared(True)))]
+    print(f"{'layout':<22} {'bytes/flight':>13} {'GiB/year':>9}")
+    for label, total in rows:
+        print(f"{label:<22} {total / sample:>13,.0f} {total / sample * flights_per_year / 2**30:>9.2f}")
+    started = time.perf_counter()
+    for i in range(sample):
+        Flight(f"F{i}", date, shared_aircraft, "10:00", "12:00", "DEL", "BLR").inventory
+    print(f"create flight + inventory: {(time.perf_counter() - started) / sample * 1e6:.1f} us")
+
+def bench_stress(n_threads=16, n_flights=4, attempts=5_000, seed=3):
+    """Concurrent singles, groups and cancellations; verifies no seat is ever double booked."""
+    print(f"== Booking stress: {n_threads} threads x {attempts:,} attempts on {n_flights} flights ==")
+    aircraft = build_aircraft("VT-A320")
+    seat_ids = list(aircraft.seats)
+    date = datetime(2025, 1, 1)
+    flights = [Flight(f"F{i}", date, aircraft, "10:00", "12:00", "DEL", "BLR") for i in range(n_flights)]
+    # (thread, flight index) -> seats the thread believes it holds
+    claimed = [[set() for _ in flights] for _ in range(n_threads)]
+
+    def worker(t):
+        rng = random.Random(seed * 1000 + t)
+        customer = f"cust{t}"
+        for _ in range(attempts):
+            f = rng.randrange(n_flights)
+            roll = rng.random()
+            if roll < 0.05:
+                if flights[f].cancel_for_customer(customer):
+                    claimed[t][f].clear()
+                continue
+            group = rng.sample(seat_ids, 1 if roll < 0.6 else rng.randint(2, 6))
+            if flights[f].book_seats(group, customer):
+                claimed[t][f].update(group)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches to expose races
+    try:
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    booked = 0
+    for f, flight in enumerate(flights):
+        owners = {}
+        for t in range(n_threads):
+            for seat_id in claimed[t][f]:
+                assert seat_id not in owners, f"{seat_id} on {flight.flight_id} double booked"
+                owners[seat_id] = f"cust{t}"
+            assert flight.seats_of(f"cust{t}") == sorted(claimed[t][f], key=flight.inventory.seat_map.index.get)
+        for seat_id in seat_ids:
+            assert flight.inventory.customer_of(seat_id) == owners.get(seat_id), f"{seat_id} owner mismatch"
+        booked += len(owners)
+    total = n_threads * attempts
+    print(f"{total:,} operations in {elapsed:.2f} s ({total / elapsed:,.0f}/s), "
+          f"{booked}/{len(seat_ids) * n_flights} seats sold, no double bookings")
+
+def bench_availability(flights_per_route=60, party_size=3, seed=4):
+    """Route search with a seat-type/party-size filter: scanning seats vs per-SeatType counters."""
+    print(f"== Availability search: {flights_per_route} flights on DEL->BLR, party of {party_size} EXTRA_LEGROOM ==")
+    rng = random.Random(seed)
+    date = datetime(2025, 1, 1)
+    for rows in (30, 140):  # A320 vs A380-sized cabin
+        aircraft = build_aircraft(f"R{rows}", rows=rows)
+        system = FlightSystem()
+        for i in range(flights_per_route):
+            minute = rng.randrange(5 * 60, 22 * 60)
+            flight = Flight(f"F{i}", date, aircraft, f"{minute // 60:02d}:{minute % 60:02d}", "23:30", "DEL", "BLR")
+            system.add_flight(flight)
+            seat_ids = list(aircraft.seats)
+            for seat_id in rng.sample(seat_ids, int(len(seat_ids) * rng.uniform(0.8, 1.0))):
+                flight.book_seat(seat_id, "cust")
+            # occasional cancellations keep the counters honest
+            for seat_id in flight.inventory.seats_of("cust")[::40]:
+                flight.inventory.cancel(seat_id)
+            for seat_type in SeatType:
+                assert flight.free_count(seat_type) == len(flight.inventory.free_seat_ids(seat_type))
+
+        def scan():
+            # walk every seat of every candidate flight
+            matches = []
+            for f in system.fetch_flights("DEL", "BLR", date):
+                free = sum(1 for seat in aircraft.seats.values()
+                           if seat.seat_type is SeatType.EXTRA_LEGROOM and f.inventory.customer_of(seat.seat_id) is None)
+                if free >= party_size:
+                    matches.append(f)
+            return matches
+
+        def counters():
+            return system.fetch_flights("DEL", "BLR", date, seat_type=SeatType.EXTRA_LEGROOM, party_size=party_size,
+                                        sort_by="availability")
+
+        assert sorted(f.flight_id for f in scan()) == sorted(f.flight_id for f in counters())
+        print(f"{len(aircraft.seats):>4} seats: scan {timed(scan, 20):>9,.1f} us   counters {timed(counters, 2000):>7,.1f} us "
+              f"({len(counters())} flights match)")
+
+def bench_ingest(n_flights=1_000_000, seed=5):
+    """Loading a season from a CSV file: one add_flight per row vs the streaming bulk importer."""
+    print(f"== Schedule ingestion: {n_flights:,} flights ==")
+    rng = random.Random(seed)
+    templates = default_templates()
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "season.csv")
+        jsonl_path = os.path.join(directory, "sample.jsonl")
+        write_schedule(csv_path, ((*row, rng.choice(list(templates))) for row in generate_schedule(n_flights)))
+        write_schedule(jsonl_path, ((*row, "A320") for row in generate_schedule(10_000, seed=6)))
+        print(f"file: {os.path.getsize(csv_path) / 2**20:.0f} MiB")
+
+        system = FlightSystem()
+        started = time.perf_counter()
+        for flight in build_flights(read_rows(csv_path), templates):
+            system.add_flight(flight)
+        one_by_one = time.perf_counter() - started
+        del system
+
+        system = FlightSystem()
+        started = time.perf_counter()
+        with paused_gc():
+            loaded = import_schedule(system, csv_path, templates)
+        streamed = time.perf_counter() - started
+        assert loaded == n_flights and len(system.flights) == n_flights
+        assert all(listing == sorted(listing) for listing in system.routes.values())
+        del system
+
+        tracemalloc.start()
+        system = FlightSystem()
+        import_schedule(system, csv_path, templates)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del system
+
+        jsonl = FlightSystem()
+        assert import_schedule(jsonl, jsonl_path, templates) == 10_000
+
+    print(f"add_flight per row   {one_by_one:>6.1f} s  ({n_flights / one_by_one:,.0f} flights/s)")
+    print(f"streaming bulk load  {streamed:>6.1f} s  ({n_flights / streamed:,.0f} flights/s)")
+    print(f"memory: retained {retained / 2**20:,.0f} MiB ({retained / n_flights:,.0f} B/flight), "
+          f"peak {peak / 2**20:,.0f} MiB")
+
+
+BENCHMARKS = {
+    "search": bench_search,
+    "connections": bench_connections,
+    "inventory_memory": bench_inventory_memory,
+    "stress": bench_stress,
+    "availability": bench_availability,
+    "ingest": bench_ingest,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
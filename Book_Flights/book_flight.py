@@ -96,8 +96,12 @@ seat belongs to an Aircraft, An aircraft has n number of seats
 # ✈️ Flight Booking System - Python (with Design Patterns)
 
 from typing import List, Dict
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from enum import Enum
+from functools import lru_cache
+from array import array
+import bisect
+import threading
 
 # ------------------ ENUMS ------------------
 class SeatType(Enum):
@@ -106,28 +110,194 @@ class SeatType(Enum):
     EMERGENCY_EXIT = "EmergencyExit"
 
 # ------------------ MODELS ------------------
+@lru_cache(maxsize=None)  # at most 1440 distinct values
+def parse_hhmm(value: str):
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+SEAT_TYPE_BY_CODE = list(SeatType)
+SEAT_TYPE_CODE = {seat_type: code for code, seat_type in enumerate(SEAT_TYPE_BY_CODE)}
+
 class Seat:
     def __init__(self, seat_id: str, seat_type: SeatType):
         self.seat_id = seat_id
         self.seat_type = seat_type
         self.customer = None  # Assigned when booked
 
+class SeatMap:
+    """Immutable seat layout shared by every flight flown with the same aircraft configuration."""
+    _shared: Dict[tuple, "SeatMap"] = {}
+
+    def __init__(self, seat_ids, type_codes):
+        self.seat_ids = tuple(seat_ids)
+        self.type_codes = bytes(type_codes)
+        self.index = {seat_id: idx for idx, seat_id in enumerate(self.seat_ids)}
+        # SeatType -> seat positions of that type
+        self.by_type: Dict[SeatType, array] = {}
+        for idx, code in enumerate(self.type_codes):
+            self.by_type.setdefault(SEAT_TYPE_BY_CODE[code], array("I")).append(idx)
+        # type code -> number of seats of that type; free = this minus the popcount of an inventory's type bitmap
+        self.type_counts = tuple(self.type_codes.count(code) for code in range(len(SEAT_TYPE_BY_CODE)))
+
+    @classmethod
+    def shared(cls, seats: List[Seat]):
+        key = (tuple(seat.seat_id for seat in seats), bytes(SEAT_TYPE_CODE[seat.seat_type] for seat in seats))
+        seat_map = cls._shared.get(key)
+        if seat_map is None:
+            seat_map = cls._shared[key] = cls(*key)
+        return seat_map
+
+    def __len__(self):
+        return len(self.seat_ids)
+
+    def seat_type(self, idx):
+        return SEAT_TYPE_BY_CODE[self.type_codes[idx]]
+
+def bit_positions(mask: int):
+    """Positions of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class SeatInventory:
+    """Per-flight bookings on top of a shared SeatMap; storage is allocated on the first booking.
+
+    Occupancy is one int bitmap per seat type (bit = seat position). Customers get a small
+    slot number: `owner` maps each position to its customer's slot in a compact array, and
+    each slot keeps a bitmap of its seats, so seat -> customer and customer -> seats are both
+    direct lookups without a reference per seat or a set per customer.
+    """
+
+    def __init__(self, seat_map: SeatMap):
+        self.seat_map = seat_map
+        self.taken = None  # copy-on-write: type code -> bitmap of booked positions
+        self.owner = None  # array("H"): position -> customer slot, 0 = free
+        self.customers = None  # slot -> customer (None = slot unused; slot 0 is never used)
+        self.masks = None  # slot -> bitmap of that customer's positions
+        self.by_customer = None  # customer -> slot
+        self.free_total = len(seat_map)
+
+    def book(self, seat_id: str, customer):
+        return self.book_many([seat_id], customer)
+
+    def book_many(self, seat_ids: List[str], customer):
+        """All-or-nothing: either every seat is free and gets booked, or nothing changes."""
+        index = self.seat_map.index
+        positions = [index.get(seat_id) for seat_id in seat_ids]
+        if not positions or None in positions or len(set(positions)) != len(positions):
+            return False
+        if self.taken is None:
+            self.taken = [0] * len(SEAT_TYPE_BY_CODE)
+            self.owner = array("H", bytes(2 * len(self.seat_map)))
+            self.customers, self.masks, self.by_customer = [None], [0], {}
+        taken, type_codes = self.taken, self.seat_map.type_codes
+        if any(taken[type_codes[idx]] >> idx & 1 for idx in positions):
+            return False
+        slot = self._slot(customer)
+        mask = 0
+        for idx in positions:
+            taken[type_codes[idx]] |= 1 << idx
+            self.owner[idx] = slot
+            mask |= 1 << idx
+        self.masks[slot] |= mask
+        self.free_total -= len(positions)
+        return True
+
+    def _slot(self, customer):
+        # Live slots never exceed the seats sold, so the array("H") cannot overflow
+        slot = self.by_customer.get(customer)
+        if slot is None:
+            try:
+                slot = self.customers.index(None, 1)  # reuse a slot freed by a full cancellation
+                self.customers[slot] = customer
+            except ValueError:
+                slot = len(self.customers)
+                self.customers.append(customer)
+                self.masks.append(0)
+            self.by_customer[customer] = slot
+        return slot
+
+    def _release(self, slot, mask):
+        # Frees the positions in `mask`, all owned by `slot`; drops the slot when it owns nothing
+        type_codes = self.seat_map.type_codes
+        for idx in bit_positions(mask):
+            self.taken[type_codes[idx]] &= ~(1 << idx)
+            self.owner[idx] = 0
+            self.free_total += 1
+        self.masks[slot] &= ~mask
+        if not self.masks[slot]:
+            del self.by_customer[self.customers[slot]]
+            self.customers[slot] = None
+
+    def cancel(self, seat_id: str):
+        idx = self.seat_map.index.get(seat_id)
+        if idx is None or self.owner is None or not self.owner[idx]:
+            return False
+        self._release(self.owner[idx], 1 << idx)
+        return True
+
+    def cancel_customer(self, customer):
+        """Frees every seat held by the customer via the reverse index; returns the freed seat ids."""
+        slot = self.by_customer.get(customer) if self.by_customer else None
+        if slot is None:
+            return []
+        positions = list(bit_positions(self.masks[slot]))
+        self._release(slot, self.masks[slot])
+        return [self.seat_map.seat_ids[idx] for idx in positions]
+
+    def seats_of(self, customer):
+        slot = self.by_customer.get(customer) if self.by_customer else None
+        return [] if slot is None else [self.seat_map.seat_ids[idx] for idx in bit_positions(self.masks[slot])]
+
+    def customer_of(self, seat_id: str):
+        idx = self.seat_map.index.get(seat_id)
+        return None if idx is None or self.owner is None else self.customers[self.owner[idx]]
+
+    def seat(self, seat_id: str):
+        """Materializes a Seat view (with its customer) for callers that want the model object."""
+        idx = self.seat_map.index.get(seat_id)
+        if idx is None:
+            return None
+        seat = Seat(seat_id, self.seat_map.seat_type(idx))
+        seat.customer = self.customer_of(seat_id)
+        return seat
+
+    def free_count(self, seat_type: SeatType = None):
+        """Type total minus the popcount of that type's bitmap: O(seats / 64), no seat walk."""
+        if seat_type is None:
+            return self.free_total
+        code = SEAT_TYPE_CODE[seat_type]
+        booked = 0 if self.taken is None else self.taken[code].bit_count()
+        return self.seat_map.type_counts[code] - booked
+
+    def free_seat_ids(self, seat_type: SeatType = None):
+        positions = self.seat_map.by_type.get(seat_type, ()) if seat_type else range(len(self.seat_map))
+        if self.taken is None:
+            return [self.seat_map.seat_ids[idx] for idx in positions]
+        taken, type_codes = self.taken, self.seat_map.type_codes
+        return [self.seat_map.seat_ids[idx] for idx in positions if not taken[type_codes[idx]] >> idx & 1]
+
 class Aircraft:
     def __init__(self, aircraft_id: str):
         self.aircraft_id = aircraft_id
-        self.seats: Dict[str, Seat] = {}
+        self.seats: Dict[str, Seat] = {}  # seat configuration; bookings live on each Flight
+        self._seat_map = None
 
     def add_seat(self, seat: Seat):
         self.seats[seat.seat_id] = seat
+        self._seat_map = None  # flights already using the old map keep it (copy-on-write)
 
-    def book_seat(self, seat_id: str, customer):
-        seat = self.seats.get(seat_id)
-        if seat and seat.customer is None:
-            seat.customer = customer
-            return True
-        return False
+    def seat_map(self):
+        if self._seat_map is None:
+            self._seat_map = SeatMap.shared(list(self.seats.values()))
+        return self._seat_map
 
 class Flight:
+    # A season holds millions of flights: no per-instance __dict__
+    __slots__ = ("flight_id", "date", "aircraft", "start_time", "end_time", "src", "dst",
+                 "departure", "arrival", "_inventory", "lock")
+
     def __init__(self, flight_id: str, date: datetime, aircraft: Aircraft, start_time: str, end_time: str, src: str, dst: str):
         self.flight_id = flight_id
         self.date = date
@@ -136,34 +306,244 @@ class Flight:
         self.end_time = end_time
         self.src = src
         self.dst = dst
+        self.departure = datetime.combine(date.date(), parse_hhmm(start_time))
+        self.arrival = datetime.combine(date.date(), parse_hhmm(end_time))
+        if self.arrival < self.departure:  # lands after midnight
+            self.arrival += timedelta(days=1)
+        self._inventory = None
+        self.lock = threading.Lock()  # guards this flight's inventory; flights never share a lock
+
+    @property
+    def inventory(self):
+        # Built on first use from the aircraft's shared seat map
+        if self._inventory is None:
+            with self.lock:
+                if self._inventory is None:
+                    self._inventory = SeatInventory(self.aircraft.seat_map())
+        return self._inventory
+
+    def book_seat(self, seat_id: str, customer):
+        return self.book_seats([seat_id], customer)
+
+    def book_seats(self, seat_ids: List[str], customer):
+        inventory = self.inventory
+        with self.lock:
+            return inventory.book_many(seat_ids, customer)
 
     def cancel_for_customer(self, customer):
-        for seat in self.aircraft.seats.values():
-            if seat.customer == customer:
-                seat.customer = None
-                return True
-        return False
+        """Cancels all of the customer's seats on this flight."""
+        inventory = self.inventory
+        with self.lock:
+            return bool(inventory.cancel_customer(customer))
+
+    def seats_of(self, customer):
+        inventory = self.inventory
+        with self.lock:
+            return inventory.seats_of(customer)
+
+    def free_count(self, seat_type: SeatType = None):
+        """Popcount of the inventory's per-type bitmap (O(seats / 64)); unsold flights answer from the
+        seat map without building an inventory."""
+        if self._inventory is None:
+            seat_map = self.aircraft.seat_map()
+            return len(seat_map) if seat_type is None else seat_map.type_counts[SEAT_TYPE_CODE[seat_type]]
+        return self._inventory.free_count(seat_type)
+
+class Itinerary:
+    def __init__(self, legs: List[Flight]):
+        self.legs = legs
+        self.departure = legs[0].departure
+        self.arrival = legs[-1].arrival
+
+    @property
+    def num_legs(self):
+        return len(self.legs)
+
+    @property
+    def duration(self):
+        return self.arrival - self.departure
+
+    def __repr__(self):
+        route = " -> ".join([self.legs[0].src] + [leg.dst for leg in self.legs])
+        return f"Itinerary({route}, {self.departure:%m-%d %H:%M} -> {self.arrival:%m-%d %H:%M}, legs={self.num_legs})"
 
 # ------------------ SYSTEM ------------------
 class FlightSystem:
+    MIN_CONNECTION = timedelta(minutes=45)
+    MAX_JOURNEY = timedelta(hours=24)
+
     def __init__(self):
-        self.flights: List[Flight] = []
+        self.flights: Dict[str, Flight] = {}  # flight_id -> Flight
+        # (src, dst, service date) -> [(departure, flight_id, flight)] sorted by departure
+        self.routes: Dict[tuple, list] = {}
+        # Connection-scan timetable: service date -> [(departure, flight_id, flight)] sorted by departure
+        self.timetable: Dict[object, list] = {}
+        self._unsorted: Dict[int, list] = {}  # index lists appended to by add_flights(sort=False)
 
     def add_flight(self, flight: Flight):
-        self.flights.append(flight)
+        if flight.flight_id in self.flights:
+            return False
+        self.sort_indexes()  # insort needs sorted lists
+        self.flights[flight.flight_id] = flight
+        listing = self.routes.setdefault((flight.src, flight.dst, flight.date.date()), [])
+        bisect.insort(listing, (flight.departure, flight.flight_id, flight))
+        bisect.insort(self.timetable.setdefault(flight.departure.date(), []), (flight.departure, flight.flight_id, flight))
         return True
 
+    def add_flights(self, flights, sort=True):
+        """Bulk load: append every flight to its index lists, then sort each touched list once.
+
+        With sort=False the sort is deferred for loading in chunks: sort_indexes() runs it,
+        and every method that bisects the indexes runs it first if it is still pending.
+        Returns the number of flights added (duplicate ids are skipped).
+        """
+        added, routes, timetable, dirty = 0, self.routes, self.timetable, self._unsorted
+        for flight in flights:
+            if flight.flight_id in self.flights:
+                continue
+            self.flights[flight.flight_id] = flight
+            entry = (flight.departure, flight.flight_id, flight)
+            listing = routes.get((flight.src, flight.dst, flight.date.date()))
+            if listing is None:
+                listing = routes[(flight.src, flight.dst, flight.date.date())] = []
+            listing.append(entry)
+            dirty[id(listing)] = listing
+            day = timetable.get(flight.departure.date())
+            if day is None:
+                day = timetable[flight.departure.date()] = []
+            day.append(entry)
+            dirty[id(day)] = day
+            added += 1
+        if sort:
+            self.sort_indexes()
+        return added
+
+    def sort_indexes(self):
+        # Timsort merges the already-sorted prefix with the appended run; no-op when nothing is pending
+        for listing in self._unsorted.values():
+            listing.sort()
+        self._unsorted.clear()
+
     def cancel_flight(self, flight: Flight):
-        if flight in self.flights:
-            self.flights.remove(flight)
-            return True
-        return False
+        if self.flights.get(flight.flight_id) is not flight:
+            return False
+        self.sort_indexes()
+        del self.flights[flight.flight_id]
+        key = (flight.src, flight.dst, flight.date.date())
+        listing = self.routes[key]
+        # (departure, flight_id) sorts just before its full entry
+        del listing[bisect.bisect_left(listing, (flight.departure, flight.flight_id))]
+        if not listing:
+            del self.routes[key]
+        day = self.timetable[flight.departure.date()]
+        del day[bisect.bisect_left(day, (flight.departure, flight.flight_id))]
+        return True
 
-    def fetch_flights(self, src: str, dst: str, date: datetime):
-        return [f for f in self.flights if f.src == src and f.dst == dst and f.date.date() == date.date()]
+    def fetch_flights(self, src: str, dst: str, date: datetime, depart_after: str = None, depart_before: str = None,
+                      seat_type: SeatType = None, party_size: int = 0, sort_by: str = "departure"):
+        """Flights on the route that day, optionally within [depart_after, depart_before).
+
+        With seat_type / party_size only flights with at least party_size free seats (of that type)
+        are returned; sort_by is "departure" or "availability" (most free seats first, then departure).
+        Availability is a popcount of each flight's per-type seat bitmap, one machine word per 64 seats,
+        so it stays cheap however large the aircraft.
+        """
+        self.sort_indexes()
+        listing = self.routes.get((src, dst, date.date()), [])
+        lo, hi = 0, len(listing)
+        if depart_after:
+            lo = bisect.bisect_left(listing, (datetime.combine(date.date(), parse_hhmm(depart_after)),))
+        if depart_before:
+            hi = bisect.bisect_left(listing, (datetime.combine(date.date(), parse_hhmm(depart_before)),))
+        flights = [flight for _, _, flight in listing[lo:hi]]
+        if party_size or seat_type is not None:
+            flights = [flight for flight in flights if flight.free_count(seat_type) >= max(party_size, 1)]
+        if sort_by == "availability":
+            flights.sort(key=lambda flight: -flight.free_count(seat_type))  # stable: ties stay by departure
+        elif sort_by != "departure":
+            raise ValueError(f"unknown sort_by: {sort_by}")
+        return flights
+
+    def _connections(self, start: datetime, end: datetime):
+        # Timetable entries departing in [start, end), in departure order
+        self.sort_indexes()
+        day = start.date()
+        while day <= end.date():
+            listing = self.timetable.get(day, [])
+            lo = bisect.bisect_left(listing, (start,)) if day == start.date() else 0
+            for i in range(lo, len(listing)):
+                if listing[i][0] >= end:
+                    return
+                yield listing[i]
+            day += timedelta(days=1)
+
+    def find_itineraries(self, src: str, dst: str, depart_after: datetime, max_legs: int = 3,
+                         min_connection: timedelta = None, max_journey: timedelta = None, earliest_only=False):
+        """Pareto-optimal itineraries: fewest legs first, each later one arriving strictly earlier.
+
+        Connection scan over the departure-sorted timetable; label[k][airport] is the earliest
+        arrival using at most k legs, so the max-legs limit costs O(max_legs) per connection.
+        With earliest_only the scan stops as soon as nothing can arrive earlier (fewer-leg
+        alternatives that arrive later are then not searched for).
+        """
+        mct = self.MIN_CONNECTION if min_connection is None else min_connection
+        end = depart_after + (self.MAX_JOURNEY if max_journey is None else max_journey)
+        # label = (arrival, flight, previous label); the origin label lets the first leg skip the MCT
+        best: List[Dict[str, tuple]] = [{src: (depart_after - mct, None, None)}] + [{} for _ in range(max_legs)]
+        reached = {src}
+        bound = [None] * (max_legs + 1)  # bound[k]: earliest arrival at dst with <= k legs
+
+        levels = range(1, max_legs + 1)
+        prune_level = max_legs if earliest_only else 1
+        for departure, _, flight in self._connections(depart_after, end):
+            origin = flight.src
+            if origin not in reached:
+                continue
+            if bound[prune_level] is not None and departure >= bound[prune_level]:
+                break  # nothing departing now can improve a level we still care about
+            ready = departure - mct
+            arrival, target = flight.arrival, flight.dst
+            for k in levels:
+                previous = best[k - 1].get(origin)
+                if previous is None or previous[0] > ready:
+                    continue
+                if bound[k] is not None and arrival >= bound[k]:
+                    continue
+                current = best[k].get(target)
+                if current is None or arrival < current[0]:
+                    best[k][target] = (arrival, flight, previous)
+                    reached.add(target)
+                    if target == dst:
+                        for j in range(k, max_legs + 1):
+                            if bound[j] is None or arrival < bound[j]:
+                                bound[j] = arrival
+
+        itineraries, earliest = [], None
+        for k in range(1, max_legs + 1):
+            label = best[k].get(dst)
+            if label is None or (earliest is not None and label[0] >= earliest):
+                continue
+            earliest = label[0]
+            legs = []
+            while label[1] is not None:
+                legs.append(label[1])
+                label = label[2]
+            itineraries.append(Itinerary(legs[::-1]))
+        return itineraries
+
+    def earliest_arrival(self, src: str, dst: str, depart_after: datetime, **options):
+        itineraries = self.find_itineraries(src, dst, depart_after, earliest_only=True, **options)
+        return itineraries[-1] if itineraries else None
+
+    def fewest_legs(self, src: str, dst: str, depart_after: datetime, **options):
+        itineraries = self.find_itineraries(src, dst, depart_after, **options)
+        return itineraries[0] if itineraries else None
 
     def book_seat(self, flight: Flight, seat_id: str, customer):
-        return flight.aircraft.book_seat(seat_id, customer)
+        return flight.book_seat(seat_id, customer)
+
+    def book_seats(self, flight: Flight, seat_ids: List[str], customer):
+        return flight.book_seats(seat_ids, customer)
 
 # ------------------ USERS ------------------
 class User:
@@ -177,6 +557,9 @@ class Customer(User):
     def book_seat(self, flight: Flight, seat_id: str):
         return self.system.book_seat(flight, seat_id, self)
 
+    def book_seats(self, flight: Flight, seat_ids: List[str]):
+        return self.system.book_seats(flight, seat_ids, self)
+
     def cancel_booking(self, flight: Flight):
         return flight.cancel_for_customer(self)
 
@@ -214,3 +597,26 @@ if __name__ == "__main__":
 
     if customer.book_seat(flight, "S1"):
         print("Seat S1 rebooked successfully!")
+
+    evening = Flight("F1002", datetime(2025, 7, 20), aircraft, "18:30", "21:00", "DEL", "BLR")
+    admin.add_flight(evening)
+    if customer.book_seat(evening, "S1"):
+        print("Seat S1 booked on the evening flight too (same aircraft, separate inventory)")
+    family = Customer("cust2", "Jane Roe", "jane@example.com", system)
+    if not family.book_seats(evening, ["S1", "S2", "S3"]):
+        print("Group booking S1-S3 rejected as a whole (S1 taken)")
+    if family.book_seats(evening, ["S2", "S3", "S4"]):
+        print("Group booked:", evening.seats_of(family))
+    if family.cancel_booking(evening):
+        print("Group cancelled, free:", evening.inventory.free_seat_ids())
+    print("All DEL->BLR:", [f.flight_id for f in system.fetch_flights("DEL", "BLR", datetime(2025, 7, 20))])
+    print("2 free seats, most available first:",
+          [f.flight_id for f in system.fetch_flights("DEL", "BLR", datetime(2025, 7, 20), party_size=2, sort_by="availability")])
+    print("After 12:00:", [f.flight_id for f in system.fetch_flights("DEL", "BLR", datetime(2025, 7, 20), depart_after="12:00")])
+
+    admin.add_flight(Flight("F2001", datetime(2025, 7, 20), aircraft, "07:00", "09:00", "DEL", "BOM"))
+    admin.add_flight(Flight("F2002", datetime(2025, 7, 20), aircraft, "10:00", "11:30", "BOM", "MAA"))
+    admin.add_flight(Flight("F2003", datetime(2025, 7, 20), aircraft, "13:00", "14:00", "MAA", "BLR"))
+    admin.add_flight(Flight("F2004", datetime(2025, 7, 20), aircraft, "10:00", "11:00", "BOM", "BLR"))
+    for itinerary in system.find_itineraries("DEL", "BLR", datetime(2025, 7, 20, 6, 0)):
+        print(itinerary, [leg.flight_id for leg in itinerary.legs])
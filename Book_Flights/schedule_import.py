@@ -0,0 +1,127 @@
+# 📥 Streaming schedule importer for FlightSystem
+#
+# Usage:
+#   python schedule_import.py season.csv        # flight_id,date,start,end,src,dst,aircraft
+#   python schedule_import.py season.jsonl      # one {"flight_id": ..., ...} object per line
+#
+# The file is read lazily and flows through a generator pipeline
+# (read rows -> build flights -> chunk -> bulk index), so memory holds the
+# flights themselves plus one chunk, never the whole file.
+
+import csv
+import gc
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+from book_flight import Aircraft, Flight, FlightSystem, Seat, SeatType
+
+FIELDS = ("flight_id", "date", "start", "end", "src", "dst", "aircraft")
+
+
+@lru_cache(maxsize=4096)  # a season has a few hundred distinct dates
+def parse_date(value: str):
+    return datetime.fromisoformat(value)
+
+
+def read_rows(path):
+    """Yields one tuple per schedule row, in FIELDS order, from a .csv (with header) or .jsonl file."""
+    with open(path, newline="") as handle:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    yield tuple(record[field] for field in FIELDS)
+        else:
+            reader = csv.reader(handle)
+            header = next(reader)
+            positions = [header.index(field) for field in FIELDS]
+            if positions == list(range(len(FIELDS))):
+                yield from reader
+            else:
+                for row in reader:
+                    yield tuple(row[i] for i in positions)
+
+
+def build_flights(rows, aircraft_templates):
+    """Turns rows into Flights; every flight of an aircraft type shares that template's seat map."""
+    for flight_id, date, start, end, src, dst, aircraft_name in rows:
+        aircraft = aircraft_templates.get(aircraft_name)
+        if aircraft is None:
+            raise ValueError(f"unknown aircraft {aircraft_name!r} for flight {flight_id}")
+        yield Flight(flight_id, parse_date(date), aircraft, start, end, src, dst)
+
+
+def chunked(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_schedule(system: FlightSystem, path, aircraft_templates, chunk_size=50_000):
+    """Streams a schedule file into the system; returns the number of flights added."""
+    added = 0
+    try:
+        for chunk in chunked(build_flights(read_rows(path), aircraft_templates), chunk_size):
+            added += system.add_flights(chunk, sort=False)
+    finally:
+        system.sort_indexes()  # one sort per index list, after the last chunk
+    return added
+
+
+@contextmanager
+def paused_gc():
+    """Pauses the cyclic GC for a bulk load and restores its previous state.
+
+    Left to the caller: the pause is process-wide, so only a script that
+    owns the process should take it."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def write_schedule(path, rows):
+    """Writes (flight_id, date, start, end, src, dst, aircraft) tuples as .csv or .jsonl."""
+    with open(path, "w", newline="") as handle:
+        if path.endswith((".jsonl", ".ndjson")):
+            for row in rows:
+                values = dict(zip(FIELDS, row))
+                values["date"] = values["date"].date().isoformat()
+                handle.write(json.dumps(values) + "\n")
+        else:
+            writer = csv.writer(handle)
+            writer.writerow(FIELDS)
+            for flight_id, date, *rest in rows:
+                writer.writerow((flight_id, date.date().isoformat(), *rest))
+
+
+def default_templates():
+    """A320 (180 seats) and B737 (162 seats) cabins with extra-legroom and exit rows."""
+    templates = {}
+    for name, rows in (("A320", 30), ("B737", 27)):
+        aircraft = Aircraft(name)
+        for row in range(1, rows + 1):
+            seat_type = SeatType.EMERGENCY_EXIT if row in (12, 13) else SeatType.EXTRA_LEGROOM if row <= 3 else SeatType.REGULAR
+            for letter in "ABCDEF":
+                aircraft.add_seat(Seat(f"{row}{letter}", seat_type))
+        templates[name] = aircraft
+    return templates
+
+
+if __name__ == "__main__":
+    system = FlightSystem()
+    started = time.perf_counter()
+    with paused_gc():  # the load only creates long-lived objects; full collections would rescan them all
+        count = import_schedule(system, sys.argv[1], default_templates())
+    print(f"imported {count:,} flights in {time.perf_counter() - started:.1f}s")
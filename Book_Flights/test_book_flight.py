@@ -0,0 +1,127 @@
+import random
+import sys
+import threading
+import unittest
+from datetime import datetime
+
+from book_flight import Aircraft, Flight, FlightSystem, Seat, SeatType
+
+
+def build_aircraft(rows=4):
+    aircraft = Aircraft("VT-TEST")
+    for row in range(1, rows + 1):
+        for letter in "ABCDEF":
+            seat_type = SeatType.EXTRA_LEGROOM if row == 1 else SeatType.EMERGENCY_EXIT if row == 2 else SeatType.REGULAR
+            aircraft.add_seat(Seat(f"{row}{letter}", seat_type))
+    return aircraft
+
+
+class SeatInventoryTest(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight("F1", datetime(2025, 1, 1), build_aircraft(), "10:00", "12:00", "DEL", "BLR")
+        self.inventory = self.flight.inventory
+
+    def test_unsold_flight_allocates_nothing(self):
+        self.assertIsNone(self.inventory.taken)
+        self.assertEqual(self.inventory.free_count(SeatType.EXTRA_LEGROOM), 6)
+        self.assertIsNone(self.inventory.customer_of("1A"))
+        self.assertEqual(len(self.inventory.free_seat_ids()), 24)
+
+    def test_book_and_cancel_keep_per_type_counts(self):
+        self.assertTrue(self.flight.book_seats(["1A", "2B", "3C"], "alice"))
+        self.assertTrue(self.flight.book_seat("1B", "bob"))
+        self.assertFalse(self.flight.book_seats(["1C", "1B"], "carol"))  # all-or-nothing
+        self.assertIsNone(self.inventory.customer_of("1C"))
+        self.assertEqual(self.inventory.free_count(SeatType.EXTRA_LEGROOM), 4)
+        self.assertEqual(self.inventory.free_count(SeatType.EMERGENCY_EXIT), 5)
+        self.assertEqual(self.inventory.free_count(), 20)
+        self.assertEqual(self.flight.seats_of("alice"), ["1A", "2B", "3C"])
+        self.assertEqual(self.inventory.customer_of("1B"), "bob")
+        self.assertEqual(self.inventory.seat("2B").customer, "alice")
+
+        self.assertTrue(self.inventory.cancel("2B"))
+        self.assertFalse(self.inventory.cancel("2B"))
+        self.assertEqual(self.flight.seats_of("alice"), ["1A", "3C"])
+        self.assertTrue(self.flight.cancel_for_customer("alice"))
+        self.assertEqual(self.inventory.by_customer, {"bob": self.inventory.by_customer["bob"]})
+        self.assertEqual(self.inventory.free_count(), 23)
+        for seat_type in SeatType:
+            self.assertEqual(self.inventory.free_count(seat_type), len(self.inventory.free_seat_ids(seat_type)))
+
+    def test_customer_slots_are_reused_after_full_cancellation(self):
+        for n in range(200):
+            self.assertTrue(self.flight.book_seats(["3A", "3B"], f"cust{n}"))
+            self.assertEqual(self.inventory.customer_of("3B"), f"cust{n}")
+            self.assertTrue(self.flight.cancel_for_customer(f"cust{n}"))
+        self.assertTrue(self.flight.book_seat("4A", "dave"))
+        self.assertTrue(self.inventory.cancel("4A"))
+        self.assertIsNone(self.inventory.customer_of("4A"))
+        self.assertEqual(len(self.inventory.customers), 2)  # the sentinel plus one reused slot
+        self.assertEqual(self.inventory.by_customer, {})
+
+    def test_unknown_or_repeated_seats_are_rejected(self):
+        self.assertFalse(self.flight.book_seats(["1A", "9Z"], "alice"))
+        self.assertFalse(self.flight.book_seats(["1A", "1A"], "alice"))
+        self.assertFalse(self.flight.book_seats([], "alice"))
+        self.assertEqual(self.inventory.free_count(), 24)
+
+
+class DeferredSortTest(unittest.TestCase):
+    def setUp(self):
+        aircraft = build_aircraft(rows=1)
+        self.date = datetime(2025, 1, 1)
+        self.system = FlightSystem()
+        self.late = Flight("F0", self.date, aircraft, "12:00", "14:00", "DEL", "BLR")
+        self.early = Flight("F1", self.date, aircraft, "07:00", "09:00", "DEL", "BLR")
+        self.system.add_flights([self.late, self.early], sort=False)
+
+    def test_fetch_sorts_pending_indexes(self):
+        found = self.system.fetch_flights("DEL", "BLR", self.date, depart_after="10:00")
+        self.assertEqual([f.flight_id for f in found], ["F0"])
+
+    def test_cancel_removes_the_right_entry(self):
+        self.assertTrue(self.system.cancel_flight(self.early))
+        self.assertEqual([f.flight_id for f in self.system.fetch_flights("DEL", "BLR", self.date)], ["F0"])
+        self.assertEqual([entry[1] for entry in self.system.timetable[self.date.date()]], ["F0"])
+
+    def test_add_flight_after_bulk_load_keeps_order(self):
+        self.system.add_flight(Flight("F2", self.date, build_aircraft(rows=1), "10:00", "11:00", "DEL", "BLR"))
+        self.assertEqual([f.flight_id for f in self.system.fetch_flights("DEL", "BLR", self.date)], ["F1", "F2", "F0"])
+        self.assertEqual(self.system.fewest_legs("DEL", "BLR", datetime(2025, 1, 1, 6)).legs, [self.early])
+
+
+class BookingStressTest(unittest.TestCase):
+    def test_racing_customers_never_share_a_seat(self):
+        flight = Flight("F1", datetime(2025, 1, 1), build_aircraft(), "10:00", "12:00", "DEL", "BLR")
+        seat_ids = list(flight.aircraft.seats)
+        pairs = [seat_ids[i:i + 2] for i in range(0, len(seat_ids), 2)]
+        claimed = {t: [] for t in range(4)}  # thread -> seats it was told it booked
+
+        def worker(t):
+            # every thread tries every pair, each in its own order
+            for pair in random.Random(t).sample(pairs, len(pairs)):
+                if flight.book_seats(pair, f"cust{t}"):
+                    claimed[t].extend(pair)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # force frequent thread switches to expose races
+        try:
+            threads = [threading.Thread(target=worker, args=(t,)) for t in claimed]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        owners = [seat_id for seats in claimed.values() for seat_id in seats]
+        self.assertEqual(sorted(owners), sorted(seat_ids))  # every seat sold exactly once
+        for t, seats in claimed.items():
+            self.assertEqual(sorted(flight.seats_of(f"cust{t}")), sorted(seats))
+            for seat_id in seats:
+                self.assertEqual(flight.inventory.customer_of(seat_id), f"cust{t}")
+        self.assertEqual(flight.free_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,394 @@
+# 📊 BookMyShow benchmarks
+#
+# Usage:
+#   python benchmark.py            # run all benchmarks
+#   python benchmark.py memory     # run one benchmark by name
+
+import asyncio
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from bookmyshow import (
+    City, Movie, Seat, Screen, Show, Theatre, SeatCategory, SeatHoldManager, LockingMode,
+    MovieController, TheatreController, BookMyShow, LockBookingEngine, ActorBookingEngine,
+    AvailabilityCache,
+)
+
+# ----------------------------- Helpers -----------------------------
+def build_screen(n_seats, screen_id=1, seats_per_row=None):
+    silver, gold = int(n_seats * 0.4), int(n_seats * 0.7)
+    seats = []
+    for i in range(n_seats):
+        category = SeatCategory.SILVER if i < silver else SeatCategory.GOLD if i < gold else SeatCategory.PLATINUM
+        if seats_per_row:
+            seats.append(Seat(i, category, i // seats_per_row, i % seats_per_row))
+        else:
+            seats.append(Seat(i, category))
+    return Screen(screen_id, seats)
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6  # microseconds per call
+
+def traced_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def deep_sizeof_set(values):
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+# ----------------------------- Benchmarks -----------------------------
+def bench_memory():
+    """Seat inventory footprint per show: legacy set of booked ids vs seat bitmap."""
+    print("== Seat inventory memory per show ==")
+    print(f"{'seats':>6} {'booked':>7} {'set bytes':>10} {'bitmap bytes':>13}")
+    movie = Movie(1, "AVENGERS", 128)
+    for n_seats in (100, 5000):
+        screen = build_screen(n_seats)
+        for fill in (0.0, 0.5, 1.0):
+            show = Show(1, movie, screen, 10)
+            booked = list(range(int(n_seats * fill)))
+            if booked:
+                show.book_seats(booked)
+            legacy = set(booked)
+            print(f"{n_seats:>6} {len(booked):>7} {deep_sizeof_set(legacy):>10} {sys.getsizeof(show.booked_mask):>13}")
+
+def bench_holds(n_holds=100_000, n_shows=20, n_threads=8, ttl_seconds=1.0):
+    """Stress test: 100k concurrent seat holds expiring through one timing-wheel thread."""
+    print(f"== {n_holds:,} concurrent holds ({n_threads} threads, ttl={ttl_seconds}s) ==")
+    movie = Movie(1, "AVENGERS", 128)
+    seats_per_show = n_holds // n_shows
+    screen = build_screen(seats_per_show)
+    shows = [Show(i, movie, screen, 10) for i in range(n_shows)]
+    manager = SeatHoldManager()
+    manager.start()
+    confirmed = [0] * n_threads
+    released = [0] * n_threads
+
+    def worker(tid):
+        for n in range(tid, n_holds, n_threads):
+            hold = manager.hold(shows[n % n_shows], [n // n_shows], ttl_seconds)
+            assert hold is not None
+            if n % 10 == 0:
+                confirmed[tid] += manager.confirm(hold)
+            elif n % 10 == 1:
+                released[tid] += manager.release(hold)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    pending = len(manager.wheel)
+    print(f"placed {n_holds:,} holds in {elapsed:.2f}s ({n_holds / elapsed:,.0f} holds/s), pending expiry: {pending:,}")
+
+    deadline = time.monotonic() + ttl_seconds + 5
+    while len(manager.wheel) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    drained = time.perf_counter() - started
+    manager.stop()
+
+    booked = sum(show.booked_mask.bit_count() for show in shows)
+    held = sum(show.held_mask.bit_count() + len(show.holds) for show in shows)
+    print(f"all holds expired after {drained:.2f}s; confirmed={sum(confirmed):,} released={sum(released):,} "
+          f"booked={booked:,} still held={held}")
+    assert held == 0 and booked == sum(confirmed), "hold state leaked"
+
+def bench_catalog(n_theatres=10_000, shows_per_theatre=50, n_movies=200, queries=200):
+    """Catalog lookups at 10k theatres x 50 shows: linear scans vs maintained indexes."""
+    print(f"== Catalog lookups: {n_theatres:,} theatres x {shows_per_theatre} shows ==")
+    rng = random.Random(1)
+    cities = list(City)
+    movies = [Movie(i, f"MOVIE-{i}", 120) for i in range(n_movies)]
+    screen = build_screen(100)  # shared: this benchmark is about lookups, not seats
+    movie_controller, theatre_controller = MovieController(), TheatreController()
+    for movie in movies:
+        for city in cities:
+            movie_controller.add_movie(movie, city)
+
+    started = time.perf_counter()
+    show_id = 0
+    for theatre_id in range(n_theatres):
+        city = cities[theatre_id % len(cities)]
+        theatre = Theatre(theatre_id, city, [screen], [])
+        for _ in range(shows_per_theatre):
+            show_id += 1
+            theatre.shows.append(Show(show_id, rng.choice(movies), screen, rng.randrange(8, 24)))
+        theatre_controller.add_theatre(theatre, city)
+    print(f"built and indexed {show_id:,} shows in {time.perf_counter() - started:.2f}s")
+
+    def linear_movie(name, city):
+        return next((m for m in movie_controller.get_movies_by_city(city) if m.movie_name == name), None)
+
+    def linear_shows(movie, city):
+        result = {}
+        for theatre in theatre_controller.city_theatres.get(city, []):
+            movie_shows = [show for show in theatre.shows if show.movie.movie_id == movie.movie_id]
+            if movie_shows:
+                result[theatre] = movie_shows
+        return result
+
+    def linear_show(show_id):
+        return next((show for theatre in theatre_controller.all_theatres for show in theatre.shows
+                     if show.show_id == show_id), None)
+
+    name, movie, city = movies[-1].movie_name, movies[-1], cities[0]
+    rows = [
+        ("movie by name", lambda: linear_movie(name, city), lambda: movie_controller.get_movie_in_city(name, city), queries),
+        ("shows by movie+city", lambda: linear_shows(movie, city), lambda: theatre_controller.get_show_listings(movie, city), 5),
+        ("show by id", lambda: linear_show(show_id), lambda: theatre_controller.get_show(show_id), 5),
+    ]
+    print(f"{'lookup':<20} {'linear us':>12} {'indexed us':>12}")
+    for label, linear, indexed, repeat in rows:
+        print(f"{label:<20} {timed(linear, repeat):>12,.1f} {timed(indexed, queries):>12,.1f}")
+
+def bench_contention(n_threads=16, ops_per_thread=5_000, hot_seats=4):
+    """Booking throughput and conflict rate: optimistic vs pessimistic, hot vs cold seats."""
+    print(f"== Booking contention ({n_threads} threads x {ops_per_thread:,} book+cancel ops) ==")
+    movie = Movie(1, "AVENGERS", 128)
+    screen = build_screen(5000)
+
+    def run(locking, hot):
+        show = Show(1, movie, screen, 10, locking=locking)
+        booked = [0] * n_threads
+
+        def worker(tid):
+            rng = random.Random(tid)
+            base = tid * 100
+            for _ in range(ops_per_thread):
+                seat = rng.randrange(hot_seats) if hot else base + rng.randrange(100)
+                if show.book_seats([seat]):
+                    booked[tid] += 1
+                    show.cancel_seats([seat])
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        attempts = n_threads * ops_per_thread
+        return attempts / elapsed, sum(booked) / attempts, show.conflicts / attempts
+
+    # Force frequent GIL hand-offs so threads actually interleave inside book_seats
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        print(f"{'mode':<12} {'seats':<5} {'ops/s':>10} {'success':>8} {'conflicts/op':>13}")
+        for locking in LockingMode:
+            for hot in (True, False):
+                ops, success, conflict_rate = run(locking, hot)
+                print(f"{locking.value:<12} {'hot' if hot else 'cold':<5} {ops:>10,.0f} {success:>8.1%} {conflict_rate:>13.5f}")
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+def bench_best_available(n_seats=5000, seats_per_row=100, fill=0.7, queries=2000):
+    """Best-available block search on a large screen: per-row free-run index vs rescanning rows."""
+    print(f"== Best available: {n_seats:,} seats ({seats_per_row}/row), {fill:.0%} sold ==")
+    rng = random.Random(3)
+    screen = build_screen(n_seats, seats_per_row=seats_per_row)
+    show = Show(1, Movie(1, "AVENGERS", 128), screen, 10)
+    show.find_best_block(SeatCategory.GOLD, 1)  # build the index up front
+    for seat_id in rng.sample(range(n_seats), int(n_seats * fill)):
+        show.book_seats([seat_id])
+
+    def rescan():
+        show.free_runs = None
+        return show.find_best_block(SeatCategory.GOLD, 4)
+
+    indexed_us = timed(lambda: show.find_best_block(SeatCategory.GOLD, 4), queries)
+    rescan_us = timed(rescan, 50)
+    started = time.perf_counter()
+    booked = 0
+    while show.book_best_available(SeatCategory.GOLD, 2):
+        booked += 1
+    drain_us = (time.perf_counter() - started) / max(booked, 1) * 1e6
+    print(f"find (indexed) {indexed_us:,.1f} us | find (rescan rows) {rescan_us:,.1f} us | "
+          f"book_best_available {drain_us:,.1f} us x {booked} pairs")
+
+def bench_layout_memory(n_theatres=5_000, screens_per_theatre=4, days=7, shows_per_day=5):
+    """National-scale screen memory: 100 Seat objects per screen vs one shared SeatLayout."""
+    n_screens = n_theatres * screens_per_theatre
+    print(f"== Screen memory: {n_screens:,} screens, {n_screens * days * shows_per_day:,} shows ==")
+    app = BookMyShow()
+    layout = app.create_layout()
+    assert app.create_layout() is layout  # interned: every standard screen shares it
+
+    def legacy_screens():
+        # Before: every screen owned 100 Seat objects plus a seat_id -> Seat lookup
+        screens = []
+        for _ in range(n_screens):
+            seats = [Seat(i, SeatCategory.SILVER if i < 40 else SeatCategory.GOLD if i < 70 else SeatCategory.PLATINUM,
+                          i // 10, i % 10) for i in range(100)]
+            screens.append((seats, {seat.seat_id: seat for seat in seats}))
+        return screens
+
+    def flyweight_screens():
+        return [Screen(i, layout=layout) for i in range(n_screens)]
+
+    legacy = traced_bytes(legacy_screens)
+    flyweight = traced_bytes(flyweight_screens)
+    screen = Screen(0, layout=layout)
+    movie = Movie(1, "AVENGERS", 128)
+    per_show = traced_bytes(lambda: [Show(i, movie, screen, 10) for i in range(10_000)]) / 10_000
+    print(f"screens (seat objects) : {legacy / 2**20:,.1f} MiB")
+    print(f"screens (shared layout): {flyweight / 2**20:,.1f} MiB  ({legacy / max(flyweight, 1):,.0f}x smaller)")
+    print(f"per-show state         : {per_show:,.0f} B -> {per_show * n_screens * days * shows_per_day / 2**20:,.1f} MiB for all shows")
+    started = time.perf_counter()
+    for _ in range(100_000):
+        screen.get_seat(73)
+    print(f"get_seat (O(1), lazy Seat): {(time.perf_counter() - started) * 10:.2f} us")
+
+def bench_flash_sale(n_requests=100_000, n_seats=5000, thread_counts=(1, 4, 16)):
+    """Flash sale on one show: Show.lock contention vs a single-writer asyncio actor."""
+    print(f"== Flash sale: {n_requests:,} single-seat requests on a {n_seats:,}-seat show ==")
+    movie = Movie(1, "AVENGERS", 128)
+    screen = build_screen(n_seats)
+    rng = random.Random(5)
+    requests = [[rng.randrange(n_seats)] for _ in range(n_requests)]
+
+    def threaded(engine, n_threads, submit):
+        show = Show(1, movie, screen, 10)
+        chunk = n_requests // n_threads
+
+        def worker(tid):
+            for seat_ids in requests[tid * chunk:(tid + 1) * chunk]:
+                submit(engine, show, seat_ids)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return n_requests / (time.perf_counter() - started), show
+
+    print(f"{'engine':<34} {'req/s':>10} {'sold':>6}")
+    lock_engine = LockBookingEngine()
+    for n_threads in thread_counts:
+        rate, show = threaded(lock_engine, n_threads, lambda e, sh, ids: e.book_seats(sh, ids))
+        print(f"{f'lock, {n_threads} threads':<34} {rate:>10,.0f} {show.booked_mask.bit_count():>6}")
+
+    actor_engine = ActorBookingEngine()
+    for n_threads in thread_counts:
+        rate, show = threaded(actor_engine, n_threads, lambda e, sh, ids: e.book_seats(sh, ids))
+        print(f"{f'actor, {n_threads} threads (blocking)':<34} {rate:>10,.0f} {show.booked_mask.bit_count():>6}")
+
+    async def async_clients(engine, show):
+        return await asyncio.gather(*(engine.book(show, seat_ids) for seat_ids in requests))
+
+    show = Show(2, movie, screen, 10)
+    started = time.perf_counter()
+    asyncio.run_coroutine_threadsafe(async_clients(actor_engine, show), actor_engine.loop).result()
+    rate = n_requests / (time.perf_counter() - started)
+    actor = actor_engine.actors[show]
+    print(f"{'actor, async clients (batched)':<34} {rate:>10,.0f} {show.booked_mask.bit_count():>6}"
+          f"  avg batch {n_requests / actor.batches:,.0f}")
+    snapshot = actor_engine.availability(show)
+    print(f"published snapshot v{snapshot.version}: {snapshot.free_count(SeatCategory.GOLD)} GOLD seats free")
+    actor_engine.stop()
+
+def bench_browse(n_theatres=2_000, shows_per_theatre=20, n_movies=20, reads=200, writes_per_read=5):
+    """Browse page (free seats per category for every show of a movie in a city): recount vs cache."""
+    print(f"== Browse availability: {n_theatres:,} theatres x {shows_per_theatre} shows ==")
+    rng = random.Random(7)
+    movies = [Movie(i, f"MOVIE-{i}", 120) for i in range(n_movies)]
+    screen = build_screen(300, seats_per_row=20)
+    theatre_controller = TheatreController()
+    show_id = 0
+    for theatre_id in range(n_theatres):
+        theatre = Theatre(theatre_id, City.BANGALORE, [screen], [])
+        for _ in range(shows_per_theatre):
+            show_id += 1
+            theatre.shows.append(Show(show_id, rng.choice(movies), screen, rng.randrange(8, 24)))
+        theatre_controller.add_theatre(theatre, City.BANGALORE)
+    cache = AvailabilityCache(theatre_controller)
+    movie = movies[0]
+    listings = theatre_controller.get_show_listings(movie, City.BANGALORE)
+    layout = screen.layout
+
+    def recount():
+        # Before: count booked seats against the screen for every show on every page view
+        return [(theatre, show, {category: (mask & ~(show.booked_mask | show.held_mask)).bit_count()
+                                 for category, mask in layout.category_masks.items()})
+                for theatre, show in listings]
+
+    def browse_with_bookings(read):
+        for _ in range(writes_per_read):
+            rng.choice(listings)[1].book_seats([rng.randrange(300)])
+        return read()
+
+    recount_us = timed(lambda: browse_with_bookings(recount), reads)
+    cached_us = timed(lambda: browse_with_bookings(lambda: cache.get_availability(movie, City.BANGALORE)), reads)
+    assert [free for _, _, free in recount()] == [free for _, _, free in cache.get_availability(movie, City.BANGALORE)]
+    print(f"{len(listings):,} shows per page, {writes_per_read} bookings between page views")
+    print(f"recount {recount_us:,.0f} us/page | cached {cached_us:,.0f} us/page "
+          f"(refreshed {cache.refreshes:,} rows, reused {cache.hits:,})")
+
+def bench_journal(n_bookings=12_000, thread_counts=(1, 16), budget_us=2_000):
+    """Booking latency with and without the durable journal (group commit + fsync)."""
+    print(f"== Journal overhead: {n_bookings:,} bookings, p99 budget {budget_us:,} us ==")
+    print(f"{'mode':<22} {'p50 us':>9} {'p99 us':>9} {'bookings/s':>11} {'avg group':>10} {'max fsync us':>13}")
+    for n_threads in thread_counts:
+        for journal_dir in (None, tempfile.mkdtemp()):
+            app = BookMyShow(journal_dir=journal_dir)
+            theatre = app.theatre_controller.all_theatres[0]
+            show = Show(1_000, theatre.shows[0].movie, build_screen(n_bookings), 23)
+            app.theatre_controller.add_show(theatre, show)
+            latencies = []
+            per_thread = n_bookings // n_threads
+
+            def worker(tid):
+                for seat_id in range(tid * per_thread, (tid + 1) * per_thread):
+                    started = time.perf_counter()
+                    assert app.book(show, [seat_id], f"order-{seat_id}")
+                    latencies.append(time.perf_counter() - started)
+
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+            latencies.sort()
+            p50, p99 = latencies[len(latencies) // 2] * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6
+            group = n_bookings / app.journal.batches if app.journal else 0
+            slowest = app.journal.slowest_flush * 1e6 if app.journal else 0
+            label = f"{'journal' if journal_dir else 'memory only'}, {n_threads} thr"
+            print(f"{label:<22} {p50:>9,.0f} {p99:>9,.0f} {n_bookings / elapsed:>11,.0f} {group:>10.1f} {slowest:>13,.0f}"
+                  + ("" if not journal_dir else "  within budget" if p99 <= budget_us else "  OVER BUDGET"))
+            app.close()
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "holds": bench_holds,
+    "catalog": bench_catalog,
+    "contention": bench_contention,
+    "best_available": bench_best_available,
+    "layout_memory": bench_layout_memory,
+    "flash_sale": bench_flash_sale,
+    "browse": bench_browse,
+    "journal": bench_journal,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -1,8 +1,18 @@
 # Movie Ticket Booking System - Full Python Code with Optimistic Locking
 
+from abc import ABC, abstractmethod
 from enum import Enum
 from typing import List, Dict
+from array import array
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import random
 import threading
+import time
+import uuid
 
 # ----------------------------- Enums -----------------------------
 class City(Enum):
@@ -14,6 +24,10 @@ class SeatCategory(Enum):
     GOLD = "Gold"
     PLATINUM = "Platinum"
 
+class LockingMode(Enum):
+    OPTIMISTIC = "Optimistic"
+    PESSIMISTIC = "Pessimistic"
+
 # ----------------------------- Models -----------------------------
 class Movie:
     def __init__(self, movie_id, name, duration_minutes):
@@ -22,40 +36,392 @@ class Movie:
         self.movie_duration = duration_minutes
 
 class Seat:
-    def __init__(self, seat_id, category: SeatCategory):
+    def __init__(self, seat_id, category: SeatCategory, row=None, col=None):
         self.seat_id = seat_id
         self.seat_category = category
+        self.row = row  # None => single-row layout in seat order
+        self.col = col
+
+# SeatCategory <-> compact one-byte code used by seat layouts
+CATEGORY_BY_CODE = list(SeatCategory)
+CATEGORY_CODE = {category: code for code, category in enumerate(CATEGORY_BY_CODE)}
+
+class SeatLayout:
+    """Immutable seat map shared (flyweight) by every screen with the same layout.
+
+    Seats are stored as parallel arrays indexed by bit position; `Seat` objects
+    are only created on demand via `seat(idx)`.
+    """
+    _shared: Dict[tuple, "SeatLayout"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, seat_ids, category_codes, seat_rows=None, seat_cols=None):
+        n = len(seat_ids)
+        self.seat_ids = array("q", seat_ids)
+        self.category_codes = bytes(category_codes)
+        self.seat_rows = array("i", seat_rows if seat_rows is not None else [0] * n)
+        self.seat_cols = array("i", seat_cols if seat_cols is not None else range(n))
+        # seat_id -> bit position; ids 0..n-1 in order need no dict at all
+        self._dense = list(self.seat_ids) == list(range(n))
+        self.seat_index = None if self._dense else {seat_id: idx for idx, seat_id in enumerate(self.seat_ids)}
+        # SeatCategory -> bitmask of the seats in that category
+        self.category_masks: Dict[SeatCategory, int] = {}
+        for idx, code in enumerate(self.category_codes):
+            category = CATEGORY_BY_CODE[code]
+            self.category_masks[category] = self.category_masks.get(category, 0) | (1 << idx)
+        self._build_rows()
+
+    @classmethod
+    def from_seats(cls, seats: List[Seat]):
+        return cls.shared(
+            [seat.seat_id for seat in seats],
+            [CATEGORY_CODE[seat.seat_category] for seat in seats],
+            [0 if seat.row is None else seat.row for seat in seats],
+            [idx if seat.col is None else seat.col for idx, seat in enumerate(seats)],
+        )
+
+    @classmethod
+    def shared(cls, seat_ids, category_codes, seat_rows=None, seat_cols=None):
+        """Returns the interned layout for this seat map, creating it once."""
+        key = (tuple(seat_ids), bytes(category_codes),
+               tuple(seat_rows) if seat_rows is not None else None,
+               tuple(seat_cols) if seat_cols is not None else None)
+        with cls._shared_lock:
+            layout = cls._shared.get(key)
+            if layout is None:
+                layout = cls._shared[key] = cls(seat_ids, category_codes, seat_rows, seat_cols)
+            return layout
+
+    def _build_rows(self):
+        # rows[r] = bit positions in row r ordered by column; row_cols[r] = their columns (gaps = aisles)
+        by_row: Dict[int, list] = {}
+        for idx in range(len(self.seat_ids)):
+            by_row.setdefault(self.seat_rows[idx], []).append((self.seat_cols[idx], idx))
+        rows, row_cols = [], []
+        self.seat_row = array("i", bytes(4 * len(self.seat_ids)))  # bit position -> row position in self.rows
+        for r, row in enumerate(sorted(by_row)):
+            cells = sorted(by_row[row])
+            row_cols.append(tuple(col for col, _ in cells))
+            rows.append(tuple(idx for _, idx in cells))
+            for _, idx in cells:
+                self.seat_row[idx] = r
+        self.rows, self.row_cols = tuple(rows), tuple(row_cols)
+        # SeatCategory -> rows holding that category, best first (middle of the section, then further back)
+        category_rows: Dict[SeatCategory, list] = {}
+        for r, row in enumerate(self.rows):
+            for code in {self.category_codes[idx] for idx in row}:
+                category_rows.setdefault(CATEGORY_BY_CODE[code], []).append(r)
+        for category, row_list in category_rows.items():
+            mid = (row_list[0] + row_list[-1]) / 2
+            row_list.sort(key=lambda r: (abs(r - mid), -r))
+        self.category_rows = {category: tuple(row_list) for category, row_list in category_rows.items()}
+
+    def __len__(self):
+        return len(self.seat_ids)
+
+    def index_of(self, seat_id):
+        if self._dense:
+            return seat_id if isinstance(seat_id, int) and 0 <= seat_id < len(self.seat_ids) else None
+        return self.seat_index.get(seat_id)
+
+    def seat_mask(self, seat_ids):
+        mask = 0
+        for seat_id in seat_ids:
+            idx = self.index_of(seat_id)
+            if idx is None:
+                return None
+            mask |= 1 << idx
+        return mask
+
+    def seat(self, idx):
+        return Seat(self.seat_ids[idx], CATEGORY_BY_CODE[self.category_codes[idx]],
+                    self.seat_rows[idx], self.seat_cols[idx])
 
 class Screen:
-    def __init__(self, screen_id, seats):
+    def __init__(self, screen_id, seats: List[Seat] = None, layout: SeatLayout = None):
         self.screen_id = screen_id
-        self.seats = seats  # List of Seat objects
+        self.layout = layout or SeatLayout.from_seats(seats)
+
+    @property
+    def seats(self):
+        # Materialized on demand; hot paths use self.layout directly
+        return [self.layout.seat(idx) for idx in range(len(self.layout))]
+
+    def get_seat(self, seat_id):
+        idx = self.layout.index_of(seat_id)
+        return None if idx is None else self.layout.seat(idx)
+
+class Hold:
+    _ids = itertools.count(1)
+
+    def __init__(self, show, seat_ids, mask, expires_at):
+        self.hold_id = next(Hold._ids)
+        self.show = show
+        self.seat_ids = list(seat_ids)
+        self.mask = mask
+        self.expires_at = expires_at  # time.monotonic() deadline
+
+class AvailabilitySnapshot:
+    """Immutable view of a show's free seats, published for lock-free browse reads."""
+
+    def __init__(self, version, occupied_mask, layout: SeatLayout):
+        self.version = version
+        self.occupied_mask = occupied_mask
+        self.layout = layout
+
+    def is_available(self, seat_id):
+        idx = self.layout.index_of(seat_id)
+        return idx is not None and not self.occupied_mask >> idx & 1
+
+    def free_count(self, category: SeatCategory):
+        return (self.layout.category_masks.get(category, 0) & ~self.occupied_mask).bit_count()
 
 class Show:
-    def __init__(self, show_id, movie: Movie, screen: Screen, start_time):
+    MAX_RETRIES = 8
+    BACKOFF_SECONDS = 0.0001  # base for exponential backoff with jitter
+
+    def __init__(self, show_id, movie: Movie, screen: Screen, start_time, locking=LockingMode.OPTIMISTIC):
         self.show_id = show_id
         self.movie = movie
         self.screen = screen
+        self.layout = screen.layout
         self.start_time = start_time  # e.g., 14 for 2PM
-        self.booked_seat_ids = set()
-        self.version = 0  # For optimistic locking
+        self.booked_mask = 0  # Seat bitmap: bit i set => seat at layout position i is booked
+        self.held_mask = 0  # Seats temporarily held during payment
+        self.holds: Dict[int, Hold] = {}  # hold_id -> active Hold
+        self.version = 0  # For optimistic locking; bumped (under lock) after every seat-state change
         self.lock = threading.Lock()
+        self.locking = locking
+        self.conflicts = 0  # failed compare-and-set attempts
+        self.free_runs = None  # row -> [(start, length, category code)] of free seats; built on first search
+        self.published = None  # AvailabilitySnapshot: republished by actor batches, rebuilt by snapshot() when stale
+        # SeatCategory -> free (not booked, not held) seats; replaced wholesale so browse reads need no lock
+        self.free_by_category: Dict[SeatCategory, int] = {
+            category: mask.bit_count() for category, mask in self.layout.category_masks.items()}
+
+    @property
+    def booked_seat_ids(self):
+        seat_ids, mask = self.layout.seat_ids, self.booked_mask
+        return {seat_ids[idx] for idx in range(len(seat_ids)) if mask >> idx & 1}
 
     def is_seat_available(self, seat_id):
-        return seat_id not in self.booked_seat_ids
+        idx = self.layout.index_of(seat_id)
+        return idx is not None and not (self.booked_mask | self.held_mask) >> idx & 1
 
     def book_seat(self, seat_id):
+        return self.book_seats([seat_id])
+
+    def book_seats(self, seat_ids):
+        # All-or-nothing: every seat is checked and claimed together
+        if self.locking == LockingMode.PESSIMISTIC:
+            return self._book_pessimistic(seat_ids)
+        return self._book_optimistic(seat_ids)
+
+    def _book_pessimistic(self, seat_ids):
+        with self.lock:
+            mask = self.layout.seat_mask(seat_ids)
+            if not mask or (self.booked_mask | self.held_mask) & mask:
+                return False
+            self.booked_mask |= mask
+            self._occupancy_changed(mask, claimed=True)
+            self.version += 1
+            return True
+
+    def _book_optimistic(self, seat_ids):
+        mask = self.layout.seat_mask(seat_ids)
+        if not mask:
+            return False
+        for attempt in range(self.MAX_RETRIES):
+            # Lock-free read: version first, then the seat bitmaps. Writers change the
+            # bitmaps before bumping the version, so a torn read always fails validation.
+            observed_version = self.version
+            if (self.booked_mask | self.held_mask) & mask:
+                return False
+            if self._compare_and_set(observed_version, mask):
+                return True
+            time.sleep(self.BACKOFF_SECONDS * (2 ** attempt) * random.random())
+        # The version is show-wide, so conflicts may come from unrelated seats: decide under the
+        # lock rather than report a free seat as taken
+        return self._book_pessimistic(seat_ids)
+
+    def _compare_and_set(self, observed_version, mask):
+        with self.lock:
+            if self.version != observed_version:
+                self.conflicts += 1
+                return False
+            self.booked_mask |= mask
+            self._occupancy_changed(mask, claimed=True)
+            self.version += 1
+            return True
+
+    def apply_claims(self, masks, publish=True):
+        """Applies a batch of all-or-nothing claims in one critical section, in order;
+        `publish` also republishes the availability snapshot (actor batches do, replay does not)."""
+        results = []
+        with self.lock:
+            occupied = self.booked_mask | self.held_mask
+            claimed = 0
+            for mask in masks:
+                ok = bool(mask) and not occupied & mask
+                if ok:
+                    occupied |= mask
+                    claimed |= mask
+                results.append(ok)
+            if claimed:
+                self.booked_mask |= claimed
+                self._occupancy_changed(claimed, claimed=True)
+                self.version += 1
+            if publish:
+                self.published = AvailabilitySnapshot(self.version, occupied, self.layout)
+        return results
+
+    def snapshot(self):
+        """Latest published AvailabilitySnapshot, rebuilt if any seat change (cancel, hold, release,
+        expiry, locked booking) happened since it was published."""
+        published = self.published
+        if published is None or published.version != self.version:
+            with self.lock:
+                published = self.published = AvailabilitySnapshot(
+                    self.version, self.booked_mask | self.held_mask, self.layout)
+        return published
+
+    def cancel_seats(self, seat_ids):
+        mask = self.layout.seat_mask(seat_ids)
+        if not mask:
+            return False
         with self.lock:
-            current_version = self.version
-            if not self.is_seat_available(seat_id):
+            if self.booked_mask & mask != mask:
                 return False
-            # simulate optimistic check
-            if current_version != self.version:
+            self.booked_mask &= ~mask
+            self._occupancy_changed(mask, claimed=False)
+            self.version += 1
+            return True
+
+    def hold_seats(self, seat_ids, expires_at):
+        # Same all-or-nothing claim as book_seats, but into the held state
+        mask = self.layout.seat_mask(seat_ids)
+        if not mask:
+            return None
+        with self.lock:
+            if (self.booked_mask | self.held_mask) & mask:
+                return None
+            hold = Hold(self, seat_ids, mask, expires_at)
+            self.held_mask |= mask
+            self.holds[hold.hold_id] = hold
+            self._occupancy_changed(mask, claimed=True)
+            self.version += 1
+            return hold
+
+    def confirm_hold(self, hold: Hold):
+        with self.lock:
+            if self.holds.pop(hold.hold_id, None) is None:
+                return False  # already expired or released
+            self.held_mask &= ~hold.mask
+            self.booked_mask |= hold.mask
+            self.version += 1
+            return True
+
+    def release_hold(self, hold: Hold):
+        with self.lock:
+            if self.holds.pop(hold.hold_id, None) is None:
                 return False
-            self.booked_seat_ids.add(seat_id)
+            self.held_mask &= ~hold.mask
+            self._occupancy_changed(hold.mask, claimed=False)
             self.version += 1
             return True
 
+    # ---- Best-available contiguous seats (per-row free-run index) ----
+    def _row_runs(self, r, occupied):
+        runs = []
+        row, cols, codes = self.layout.rows[r], self.layout.row_cols[r], self.layout.category_codes
+        start = None
+        for pos, idx in enumerate(row):
+            free = not occupied >> idx & 1
+            if start is not None and (not free or cols[pos] != cols[pos - 1] + 1
+                                      or codes[idx] != codes[row[start]]):
+                runs.append((start, pos - start, codes[row[start]]))
+                start = None
+            if free and start is None:
+                start = pos
+        if start is not None:
+            runs.append((start, len(row) - start, codes[row[start]]))
+        return runs
+
+    def _occupancy_changed(self, mask, claimed):
+        # Called under self.lock, before the version bump, whenever seats become taken or free again
+        delta = -1 if claimed else 1
+        free = dict(self.free_by_category)
+        for category, category_mask in self.layout.category_masks.items():
+            changed = (mask & category_mask).bit_count()
+            if changed:
+                free[category] += delta * changed
+        self.free_by_category = free
+        self._refresh_rows(mask)
+
+    def _refresh_rows(self, mask):
+        # Called under self.lock after any change to booked/held seats
+        if self.free_runs is None:
+            return
+        occupied = self.booked_mask | self.held_mask
+        seat_row = self.layout.seat_row
+        rows = set()
+        while mask:
+            low = mask & -mask
+            rows.add(seat_row[low.bit_length() - 1])
+            mask ^= low
+        for r in rows:
+            self.free_runs[r] = self._row_runs(r, occupied)
+
+    def _ensure_free_runs(self):
+        if self.free_runs is None:
+            with self.lock:
+                if self.free_runs is None:
+                    occupied = self.booked_mask | self.held_mask
+                    self.free_runs = [self._row_runs(r, occupied) for r in range(len(self.layout.rows))]
+
+    def find_best_block(self, category: SeatCategory, count: int):
+        """Seat ids of the best free contiguous block of `count` seats in `category`, or None."""
+        self._ensure_free_runs()
+        layout, code = self.layout, CATEGORY_CODE[category]
+        for r in layout.category_rows.get(category, ()):
+            center = (len(layout.rows[r]) - 1) / 2
+            best = None
+            for start, length, run_code in self.free_runs[r]:
+                if run_code != code or length < count:
+                    continue
+                # block start closest to the row centre, clamped into this run
+                pos = min(max(round(center - (count - 1) / 2), start), start + length - count)
+                distance = abs(pos + (count - 1) / 2 - center)
+                if best is None or distance < best[0]:
+                    best = (distance, pos)
+            if best is not None:
+                row = layout.rows[r]
+                return [layout.seat_ids[idx] for idx in row[best[1]:best[1] + count]]
+        return None
+
+    def book_best_available(self, category: SeatCategory, count: int):
+        """Finds and atomically claims the best block; returns its seat ids or None."""
+        for _ in range(self.MAX_RETRIES):
+            seat_ids = self.find_best_block(category, count)
+            if seat_ids is None:
+                return None
+            if self.book_seats(seat_ids):
+                return seat_ids
+        return None
+
+    def available_count(self, category: SeatCategory):
+        return self.free_by_category.get(category, 0)
+
+    def available_seat_ids(self, category: SeatCategory):
+        free = self.layout.category_masks.get(category, 0) & ~(self.booked_mask | self.held_mask)
+        seat_ids = self.layout.seat_ids
+        result = []
+        while free:
+            low = free & -free
+            result.append(seat_ids[low.bit_length() - 1])
+            free ^= low
+        return result
+
 class Theatre:
     def __init__(self, theatre_id, city: City, screens: List[Screen], shows: List[Show]):
         self.theatre_id = theatre_id
@@ -68,13 +434,34 @@ class MovieController:
     def __init__(self):
         self.city_movies: Dict[City, List[Movie]] = {}
         self.all_movies: List[Movie] = []
+        # Indexes, maintained on add/remove
+        self.movies_by_name: Dict[str, Movie] = {}
+        self.city_movies_by_name: Dict[City, Dict[str, Movie]] = {}
 
     def add_movie(self, movie: Movie, city: City):
-        self.all_movies.append(movie)
-        self.city_movies.setdefault(city, []).append(movie)
+        if movie.movie_name not in self.movies_by_name:
+            self.all_movies.append(movie)
+            self.movies_by_name[movie.movie_name] = movie
+        city_index = self.city_movies_by_name.setdefault(city, {})
+        if movie.movie_name not in city_index:
+            city_index[movie.movie_name] = movie
+            self.city_movies.setdefault(city, []).append(movie)
+
+    def remove_movie(self, movie: Movie, city: City):
+        city_index = self.city_movies_by_name.get(city, {})
+        if city_index.pop(movie.movie_name, None) is None:
+            return False
+        self.city_movies[city].remove(movie)
+        if not any(movie.movie_name in index for index in self.city_movies_by_name.values()):
+            del self.movies_by_name[movie.movie_name]
+            self.all_movies.remove(movie)
+        return True
 
     def get_movie_by_name(self, name):
-        return next((m for m in self.all_movies if m.movie_name == name), None)
+        return self.movies_by_name.get(name)
+
+    def get_movie_in_city(self, name, city: City):
+        return self.city_movies_by_name.get(city, {}).get(name)
 
     def get_movies_by_city(self, city: City):
         return self.city_movies.get(city, [])
@@ -83,24 +470,443 @@ class TheatreController:
     def __init__(self):
         self.city_theatres: Dict[City, List[Theatre]] = {}
         self.all_theatres: List[Theatre] = []
+        # (city, movie_id) -> [(start_time, show_id, theatre, show)] sorted by start time
+        self.city_movie_shows: Dict[tuple, list] = {}
+        self.shows_by_id: Dict[int, Show] = {}
+        self.show_theatre: Dict[int, Theatre] = {}
+        # (city, movie_id) -> bumped whenever a show is added to / removed from that listing
+        self.listing_versions: Dict[tuple, int] = {}
 
     def add_theatre(self, theatre: Theatre, city: City):
         self.all_theatres.append(theatre)
         self.city_theatres.setdefault(city, []).append(theatre)
+        for show in theatre.shows:
+            self._index_show(theatre, show)
+
+    def remove_theatre(self, theatre: Theatre):
+        for show in theatre.shows:
+            self._unindex_show(theatre, show)
+        self.all_theatres.remove(theatre)
+        self.city_theatres[theatre.city].remove(theatre)
+
+    def add_show(self, theatre: Theatre, show: Show):
+        theatre.shows.append(show)
+        self._index_show(theatre, show)
+
+    def remove_show(self, show_id):
+        show = self.shows_by_id.get(show_id)
+        if not show:
+            return False
+        theatre = self.show_theatre[show_id]
+        theatre.shows.remove(show)
+        self._unindex_show(theatre, show)
+        return True
+
+    def _index_show(self, theatre: Theatre, show: Show):
+        listings = self.city_movie_shows.setdefault((theatre.city, show.movie.movie_id), [])
+        bisect.insort(listings, (show.start_time, show.show_id, theatre, show))
+        key = (theatre.city, show.movie.movie_id)
+        self.listing_versions[key] = self.listing_versions.get(key, 0) + 1
+        self.shows_by_id[show.show_id] = show
+        self.show_theatre[show.show_id] = theatre
+
+    def _unindex_show(self, theatre: Theatre, show: Show):
+        key = (theatre.city, show.movie.movie_id)
+        listings = self.city_movie_shows[key]
+        # (start_time, show_id) sorts just before its full entry
+        del listings[bisect.bisect_left(listings, (show.start_time, show.show_id))]
+        self.listing_versions[key] += 1
+        if not listings:
+            del self.city_movie_shows[key]
+        del self.shows_by_id[show.show_id]
+        del self.show_theatre[show.show_id]
+
+    def get_show(self, show_id):
+        return self.shows_by_id.get(show_id)
+
+    def get_show_listings(self, movie: Movie, city: City):
+        """(theatre, show) pairs for a movie in a city, earliest show first."""
+        return [(theatre, show) for _, _, theatre, show in self.city_movie_shows.get((city, movie.movie_id), [])]
 
     def get_shows_by_movie_and_city(self, movie: Movie, city: City):
         result = {}
-        for theatre in self.city_theatres.get(city, []):
-            movie_shows = [show for show in theatre.shows if show.movie.movie_id == movie.movie_id]
-            if movie_shows:
-                result[theatre] = movie_shows
+        for theatre, show in self.get_show_listings(movie, city):
+            result.setdefault(theatre, []).append(show)
         return result
 
+class AvailabilityCache:
+    """Browse-page free-seat summaries per (city, movie), revalidated per show on Show.version."""
+
+    def __init__(self, theatre_controller: TheatreController):
+        self.theatre_controller = theatre_controller
+        # (city, movie_id) -> (listing version, [[theatre, show, show version, free_by_category]])
+        self.entries: Dict[tuple, tuple] = {}
+        self.hits = 0
+        self.refreshes = 0
+
+    def get_availability(self, movie: Movie, city: City):
+        """[(theatre, show, {SeatCategory: free seats})] ordered by start time. Never takes Show.lock."""
+        key = (city, movie.movie_id)
+        listing_version = self.theatre_controller.listing_versions.get(key, 0)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != listing_version:
+            rows = [[theatre, show, -1, None] for theatre, show in self.theatre_controller.get_show_listings(movie, city)]
+            entry = self.entries[key] = (listing_version, rows)
+        for row in entry[1]:
+            show = row[1]
+            version = show.version  # read before the counters: a racing writer just forces another refresh
+            if version != row[2]:
+                row[2], row[3] = version, show.free_by_category
+                self.refreshes += 1
+            else:
+                self.hits += 1
+        return [(theatre, show, free) for theatre, show, _, free in entry[1]]
+
 # ----------------------------- Booking -----------------------------
 class Booking:
-    def __init__(self, show: Show, seats: List[Seat]):
+    def __init__(self, show: Show, seats: List[Seat], idempotency_key: str = None):
         self.show = show
         self.seats = seats
+        self.idempotency_key = idempotency_key
+
+class BookingJournal:
+    """Append-only JSON-lines booking log with group commit and snapshot compaction.
+
+    Callers enqueue records and wait until they are fsynced. Group commit is leader-based:
+    the first waiter that finds no flush in flight writes and fsyncs everything queued so
+    far as one batch while later callers queue up behind it, so a lone booking pays one
+    fsync and no thread hand-off. When the previous batch was shared, the leader first
+    yields the GIL once so bookers that are already runnable make it into its batch.
+    A failed write or fsync is kept in `error`: every waiter and every later submit
+    raises OSError instead of waiting forever.
+    """
+    JOURNAL_FILE = "bookings.journal"
+    SNAPSHOT_FILE = "bookings.snapshot.json"
+
+    def __init__(self, directory, fsync=True):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, self.JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.fsync = fsync
+        self.snapshot, records = self._load()
+        self.tail = [record for record in records if record["seq"] > self.snapshot["seq"]]
+        self.last_seq = max([self.snapshot["seq"]] + [record["seq"] for record in records])
+        self.durable_seq = self.last_seq
+        self.pending = []  # (seq, encoded line)
+        self.flushing = False  # a leader is writing a batch
+        self.batches = 0
+        self.last_batch = 0
+        self.slowest_flush = 0.0  # seconds, write + fsync of one batch
+        self.closed = False
+        self.error = None  # OSError from the failed write/fsync
+        self.lock = threading.Lock()
+        self.flushed = threading.Condition(self.lock)  # followers wait here for the leader's batch
+        self.io_lock = threading.Lock()
+        self.file = open(self.path, "ab")
+
+    def _load(self):
+        snapshot = {"seq": 0, "bookings": {}}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        records, valid_bytes = [], 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash: everything after it is discarded
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return snapshot, records
+
+    def submit(self, record):
+        """Enqueues a record and returns its sequence number (not yet durable)."""
+        body = json.dumps(record)[1:]  # encode outside the lock; seq is spliced in as the first field
+        with self.lock:
+            self._check_usable()
+            self.last_seq += 1
+            record["seq"] = self.last_seq
+            self.pending.append((self.last_seq, f'{{"seq": {self.last_seq}, {body}\n'.encode()))
+            return self.last_seq
+
+    def _check_usable(self):
+        # Called under self.lock
+        if self.error is not None:
+            raise OSError(f"booking journal {self.path} failed; records are no longer accepted") from self.error
+        if self.closed:
+            raise ValueError("booking journal is closed")
+
+    def wait_durable(self, seq):
+        """Blocks until record `seq` is fsynced, flushing the queue itself if nobody else is."""
+        with self.lock:
+            while self.durable_seq < seq:
+                if self.error is not None:
+                    self._check_usable()
+                if self.flushing:
+                    self.flushed.wait()
+                    continue
+                # Leader: nothing in flight, so `seq` is still queued. Under concurrent load (the
+                # last batch was shared) yield once first so runnable bookers join this batch.
+                self.flushing = True
+                self.lock.release()
+                try:
+                    if self.last_batch > 1:
+                        time.sleep(0)
+                    with self.lock:
+                        batch, self.pending = self.pending, []
+                    error = self._write(batch)
+                finally:
+                    self.lock.acquire()
+                    self.flushing = False
+                    self.flushed.notify_all()
+                if error is not None:
+                    self.error = error
+                else:
+                    self.durable_seq = batch[-1][0]
+                    self.batches += 1
+                    self.last_batch = len(batch)
+
+    def _write(self, batch):
+        try:
+            with self.io_lock:
+                started = time.perf_counter()
+                self.file.write(b"".join(line for _, line in batch))
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+                self.slowest_flush = max(self.slowest_flush, time.perf_counter() - started)
+        except OSError as error:
+            return error
+        return None
+
+    def append(self, record):
+        seq = self.submit(record)
+        self.wait_durable(seq)
+        return seq
+
+    def write_snapshot(self, seq, bookings):
+        """Persists state up to `seq` atomically, then drops those records from the journal."""
+        self.wait_durable(seq)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"seq": seq, "bookings": bookings}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        with self.io_lock:
+            self.file.close()
+            with open(self.path, "rb") as f:
+                keep = [line for line in f if json.loads(line)["seq"] > seq]
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.writelines(keep)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.file = open(self.path, "ab")
+
+    def close(self):
+        """Flushes records submitted but not yet waited for, then closes the file."""
+        try:
+            with self.lock:
+                last_seq = self.last_seq
+            if self.error is None:
+                self.wait_durable(last_seq)
+        finally:
+            with self.lock:
+                self.closed = True
+            with self.io_lock:
+                self.file.close()
+
+# ----------------------------- Seat Holds -----------------------------
+class TimingWheel:
+    """Hashed timing wheel: O(1) schedule/cancel, each tick only touches one bucket."""
+
+    def __init__(self, tick_seconds=0.05, wheel_size=512, clock=time.monotonic):
+        self.tick_seconds = tick_seconds
+        self.wheel_size = wheel_size
+        self.clock = clock
+        self.origin = clock()
+        self.current_tick = 0
+        self.buckets: List[Dict[Hold, int]] = [{} for _ in range(wheel_size)]  # hold -> deadline tick
+        self.slots: Dict[Hold, int] = {}  # hold -> bucket index, for O(1) cancel
+        self.lock = threading.Lock()
+
+    def _tick_of(self, deadline):
+        return int((deadline - self.origin) / self.tick_seconds) + 1
+
+    def schedule(self, hold: Hold):
+        with self.lock:
+            deadline_tick = max(self._tick_of(hold.expires_at), self.current_tick + 1)
+            slot = deadline_tick % self.wheel_size
+            self.buckets[slot][hold] = deadline_tick
+            self.slots[hold] = slot
+
+    def cancel(self, hold: Hold):
+        with self.lock:
+            slot = self.slots.pop(hold, None)
+            if slot is not None:
+                del self.buckets[slot][hold]
+
+    def advance(self, now=None):
+        """Moves the wheel up to `now` and returns the holds whose deadline has passed."""
+        now = self.clock() if now is None else now
+        expired = []
+        with self.lock:
+            target_tick = int((now - self.origin) / self.tick_seconds)
+            steps = min(target_tick - self.current_tick, self.wheel_size)
+            for step in range(1, steps + 1):
+                bucket = self.buckets[(self.current_tick + step) % self.wheel_size]
+                due = [hold for hold, deadline_tick in bucket.items() if deadline_tick <= target_tick]
+                for hold in due:
+                    del bucket[hold]
+                    del self.slots[hold]
+                expired.extend(due)
+            self.current_tick = max(self.current_tick, target_tick)
+        return expired
+
+    def __len__(self):
+        return len(self.slots)
+
+class SeatHoldManager:
+    """Temporary seat holds during payment, expired by a single background thread
+    that starts with the first hold and runs until stop()."""
+
+    def __init__(self, wheel: TimingWheel = None):
+        self.wheel = wheel or TimingWheel()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def start(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="seat-hold-expiry", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.wheel.tick_seconds):
+            self.expire_due()
+
+    def expire_due(self, now=None):
+        expired = self.wheel.advance(now)
+        for hold in expired:
+            hold.show.release_hold(hold)
+        return len(expired)
+
+    def hold(self, show: Show, seat_ids, ttl_seconds):
+        hold = show.hold_seats(seat_ids, self.wheel.clock() + ttl_seconds)
+        if hold:
+            self.wheel.schedule(hold)
+            if self._thread is None:
+                self.start()
+        return hold
+
+    def confirm(self, hold: Hold):
+        if hold.show.confirm_hold(hold):
+            self.wheel.cancel(hold)
+            return True
+        return False
+
+    def release(self, hold: Hold):
+        self.wheel.cancel(hold)
+        return hold.show.release_hold(hold)
+
+# ----------------------------- Booking Engines -----------------------------
+class BookingEngine(ABC):
+    @abstractmethod
+    def book_seats(self, show: Show, seat_ids) -> bool:
+        pass
+
+    def availability(self, show: Show) -> AvailabilitySnapshot:
+        return show.snapshot()
+
+class LockBookingEngine(BookingEngine):
+    """Callers claim seats directly on the show under Show.lock (optimistic or pessimistic)."""
+
+    def book_seats(self, show: Show, seat_ids):
+        return show.book_seats(seat_ids)
+
+class ShowActor:
+    """Single writer for one show: drains its request queue and applies claims in batches."""
+
+    def __init__(self, show: Show, max_batch=256):
+        self.show = show
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batches = 0
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            results = self.show.apply_claims([mask for mask, _ in batch])
+            self.batches += 1
+            for (_, future), ok in zip(batch, results):
+                if not future.done():
+                    future.set_result(ok)
+
+class ActorBookingEngine(BookingEngine):
+    """Per-show asyncio actors on one event loop (started in a background thread by default)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, max_batch=256):
+        self.max_batch = max_batch
+        self.actors: Dict[Show, ShowActor] = {}
+        self._thread = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="booking-actors", daemon=True)
+            self._thread.start()
+        self.loop = loop
+
+    def _actor(self, show: Show):
+        actor = self.actors.get(show)
+        if actor is None:
+            actor = self.actors[show] = ShowActor(show, self.max_batch)
+        return actor
+
+    def book(self, show: Show, seat_ids) -> asyncio.Future:
+        """Queues a claim and returns an awaitable Future[bool]; must be called on the engine's loop."""
+        future = self.loop.create_future()
+        self._actor(show).queue.put_nowait((show.layout.seat_mask(seat_ids), future))
+        return future
+
+    async def _book(self, show: Show, seat_ids):
+        return await self.book(show, seat_ids)
+
+    def submit(self, show: Show, seat_ids):
+        """Thread-safe submission; returns a concurrent.futures.Future[bool]."""
+        return asyncio.run_coroutine_threadsafe(self._book(show, seat_ids), self.loop)
+
+    def book_seats(self, show: Show, seat_ids):
+        return self.submit(show, seat_ids).result()
+
+    def stop(self):
+        async def shutdown():
+            for actor in self.actors.values():
+                actor.task.cancel()
+        if self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self._thread = None
 
 # ----------------------------- Payment -----------------------------
 class Payment:
@@ -109,10 +915,21 @@ class Payment:
 
 # ----------------------------- BookMyShow Main -----------------------------
 class BookMyShow:
-    def __init__(self):
+    def __init__(self, booking_engine: BookingEngine = None, journal_dir: str = None):
+        self.booking_engine = booking_engine or LockBookingEngine()
         self.movie_controller = MovieController()
         self.theatre_controller = TheatreController()
+        self.availability_cache = AvailabilityCache(self.theatre_controller)
+        self.hold_manager = SeatHoldManager()  # expiry thread starts with the first hold
+        # idempotency key -> Booking; a retried request gets the original booking back
+        self.bookings: Dict[str, Booking] = {}
+        self._inflight = set()  # keys whose claim is running; retries wait on _claim_done
+        self.bookings_lock = threading.Lock()
+        self._claim_done = threading.Condition(self.bookings_lock)
         self.initialize()
+        self.journal = BookingJournal(journal_dir) if journal_dir else None
+        if self.journal:
+            self.recover()
 
     def initialize(self):
         self.create_movies()
@@ -143,45 +960,218 @@ class BookMyShow:
         self.theatre_controller.add_theatre(pvr, City.DELHI)
 
     def create_screens(self):
-        return [Screen(1, self.create_seats())]
-
-    def create_seats(self):
-        seats = []
-        for i in range(40):
-            seats.append(Seat(i, SeatCategory.SILVER))
-        for i in range(40, 70):
-            seats.append(Seat(i, SeatCategory.GOLD))
-        for i in range(70, 100):
-            seats.append(Seat(i, SeatCategory.PLATINUM))
-        return seats
+        return [Screen(1, layout=self.create_layout())]
+
+    def create_layout(self, seats_per_row=10):
+        # Every standard screen shares one immutable layout; no per-screen Seat objects
+        seat_ids = range(100)
+        codes = [CATEGORY_CODE[SeatCategory.SILVER]] * 40 + [CATEGORY_CODE[SeatCategory.GOLD]] * 30 \
+            + [CATEGORY_CODE[SeatCategory.PLATINUM]] * 30
+        return SeatLayout.shared(seat_ids, codes,
+                                 [i // seats_per_row for i in seat_ids], [i % seats_per_row for i in seat_ids])
 
     def create_show(self, show_id, screen, movie, time):
         return Show(show_id, movie, screen, time)
 
-    def create_booking(self, city: City, movie_name: str, seat_id: int):
-        movies = self.movie_controller.get_movies_by_city(city)
-        movie = next((m for m in movies if m.movie_name == movie_name), None)
+    def browse(self, city: City, movie_name: str):
+        movie = self.movie_controller.get_movie_in_city(movie_name, city)
+        if not movie:
+            return []
+        return self.availability_cache.get_availability(movie, city)
+
+    def find_show(self, city: City, movie_name: str):
+        movie = self.movie_controller.get_movie_in_city(movie_name, city)
         if not movie:
             print("Movie not found")
-            return
+            return None
 
-        theatre_shows = self.theatre_controller.get_shows_by_movie_and_city(movie, city)
-        if not theatre_shows:
+        listings = self.theatre_controller.get_show_listings(movie, city)
+        if not listings:
             print("No shows found")
+            return None
+
+        return listings[0]
+
+    # ---- Durable, idempotent bookings ----
+    def recover(self):
+        """Rebuilds sold seats from the journal snapshot plus the journal tail."""
+        for key, entry in self.journal.snapshot["bookings"].items():
+            self._apply_booking(key, entry["show_id"], entry["seat_ids"])
+        for record in self.journal.tail:
+            if record["op"] == "book":
+                self._apply_booking(record["key"], record["show_id"], record["seat_ids"])
+            elif record["op"] == "cancel":
+                booking = self.bookings.pop(record["key"], None)
+                if booking:
+                    booking.show.cancel_seats([seat.seat_id for seat in booking.seats])
+
+    def _apply_booking(self, key, show_id, seat_ids):
+        show = self.theatre_controller.get_show(show_id)
+        if show is None or not show.apply_claims([show.layout.seat_mask(seat_ids)], publish=False)[0]:
+            print(f"Journal replay: skipped booking {key} for show {show_id}")
             return
+        self.bookings[key] = Booking(show, [show.screen.get_seat(seat_id) for seat_id in seat_ids], key)
+
+    def _idempotent(self, idempotency_key, claim):
+        """Runs `claim(key)` at most once per key; concurrent or later retries get its Booking."""
+        key = idempotency_key or str(uuid.uuid4())
+        with self.bookings_lock:
+            if key in self.bookings:
+                return self.bookings[key]
+            if key in self._inflight:
+                # A concurrent retry: no per-call Event, duplicates are rare so they share one condition
+                while key in self._inflight:
+                    self._claim_done.wait()
+                return self.bookings.get(key)
+            self._inflight.add(key)
+        try:
+            return claim(key)
+        finally:
+            with self.bookings_lock:
+                self._inflight.discard(key)
+                self._claim_done.notify_all()
 
-        theatre, shows = next(iter(theatre_shows.items()))
-        show = shows[0]
+    def _commit_booking(self, key, show: Show, seat_ids):
+        booking = Booking(show, [show.screen.get_seat(seat_id) for seat_id in seat_ids], key)
+        try:
+            with self.bookings_lock:
+                # enqueue + insert together so a snapshot never misses a journaled booking
+                seq = self.journal.submit({"op": "book", "key": key, "show_id": show.show_id,
+                                           "seat_ids": list(seat_ids)}) if self.journal else 0
+                self.bookings[key] = booking
+            if self.journal:
+                self.journal.wait_durable(seq)
+        except OSError:
+            # Never acknowledged: release the seats so memory matches what a restart would replay
+            with self.bookings_lock:
+                self.bookings.pop(key, None)
+            show.cancel_seats(seat_ids)
+            raise
+        return booking
 
-        if show.book_seat(seat_id):
-            booked_seat = next(seat for seat in show.screen.seats if seat.seat_id == seat_id)
-            booking = Booking(show, [booked_seat])
+    def book(self, show: Show, seat_ids, idempotency_key: str = None):
+        """Claims seats on a show; returns the Booking (durable once returned) or None."""
+        def claim(key):
+            if not self.booking_engine.book_seats(show, seat_ids):
+                return None
+            return self._commit_booking(key, show, seat_ids)
+        return self._idempotent(idempotency_key, claim)
+
+    def cancel_booking(self, idempotency_key: str):
+        with self.bookings_lock:
+            booking = self.bookings.get(idempotency_key)
+            if booking is None:
+                return False
+            seq = self.journal.submit({"op": "cancel", "key": idempotency_key}) if self.journal else 0
+            del self.bookings[idempotency_key]
+        booking.show.cancel_seats([seat.seat_id for seat in booking.seats])
+        if self.journal:
+            self.journal.wait_durable(seq)
+        return True
+
+    def snapshot(self):
+        with self.bookings_lock:
+            seq = self.journal.last_seq
+            state = {key: {"show_id": booking.show.show_id, "seat_ids": [seat.seat_id for seat in booking.seats]}
+                     for key, booking in self.bookings.items()}
+        self.journal.write_snapshot(seq, state)
+
+    def create_booking(self, city: City, movie_name: str, seat_id: int, idempotency_key: str = None):
+        found = self.find_show(city, movie_name)
+        if not found:
+            return None
+        theatre, show = found
+
+        booking = self.book(show, [seat_id], idempotency_key)
+        if booking:
             print(f"BOOKING SUCCESSFUL: Seat {seat_id} for '{movie_name}' at {theatre.city.value}")
         else:
             print("Seat already booked or version conflict. Try again.")
+        return booking
+
+    def book_best_available(self, city: City, movie_name: str, category: SeatCategory, count: int,
+                            idempotency_key: str = None):
+        found = self.find_show(city, movie_name)
+        if not found:
+            return None
+        theatre, show = found
+
+        def claim(key):
+            seat_ids = show.book_best_available(category, count)
+            return self._commit_booking(key, show, seat_ids) if seat_ids else None
+
+        booking = self._idempotent(idempotency_key, claim)
+        if not booking:
+            print(f"No {count} adjacent {category.value} seats available.")
+            return None
+        print(f"BOOKING SUCCESSFUL: Seats {[seat.seat_id for seat in booking.seats]} "
+              f"for '{movie_name}' at {theatre.city.value}")
+        return booking
+
+    def hold_seats(self, city: City, movie_name: str, seat_ids: List[int], ttl_seconds=300):
+        found = self.find_show(city, movie_name)
+        if not found:
+            return None
+        hold = self.hold_manager.hold(found[1], seat_ids, ttl_seconds)
+        if not hold:
+            print("Seats already booked or held. Try again.")
+        return hold
+
+    def confirm_hold(self, hold: Hold, idempotency_key: str = None):
+        def claim(key):
+            if not self.hold_manager.confirm(hold):
+                return None
+            return self._commit_booking(key, hold.show, hold.seat_ids)
+
+        booking = self._idempotent(idempotency_key, claim)
+        if not booking:
+            print("Hold expired or released. Try again.")
+            return None
+        print(f"BOOKING CONFIRMED: Seats {hold.seat_ids} for '{hold.show.movie.movie_name}'")
+        return booking
+
+    def release_hold(self, hold: Hold):
+        return self.hold_manager.release(hold)
+
+    def close(self):
+        """Stops the hold-expiry thread and flushes and closes the journal."""
+        self.hold_manager.stop()
+        if self.journal:
+            self.journal.close()
 
 # ----------------------------- Main Driver -----------------------------
 if __name__ == "__main__":
     app = BookMyShow()
     app.create_booking(City.BANGALORE, "BAAHUBALI", 30)
     app.create_booking(City.BANGALORE, "BAAHUBALI", 30)  # should fail (already booked or version conflict)
+
+    hold = app.hold_seats(City.BANGALORE, "AVENGERS", [41, 42], ttl_seconds=0.2)
+    app.hold_seats(City.BANGALORE, "AVENGERS", [42])  # should fail (held during payment)
+    time.sleep(0.5)
+    app.confirm_hold(hold)  # should fail (hold expired)
+    app.confirm_hold(app.hold_seats(City.BANGALORE, "AVENGERS", [41, 42]))
+
+    app.book_best_available(City.BANGALORE, "AVENGERS", SeatCategory.GOLD, 4)
+    app.book_best_available(City.BANGALORE, "AVENGERS", SeatCategory.GOLD, 4)
+
+    for theatre, show, free in app.browse(City.BANGALORE, "AVENGERS"):
+        print(f"{show.movie.movie_name} @ {show.start_time}:00 -> " + ", ".join(f"{c.value}: {n}" for c, n in free.items()))
+
+    import tempfile
+    journal_dir = tempfile.mkdtemp()
+    durable_app = BookMyShow(journal_dir=journal_dir)
+    durable_app.create_booking(City.DELHI, "BAAHUBALI", 12, idempotency_key="order-1")
+    durable_app.create_booking(City.DELHI, "BAAHUBALI", 12, idempotency_key="order-1")  # client retry: same booking
+    durable_app.snapshot()
+    durable_app.create_booking(City.DELHI, "BAAHUBALI", 13, idempotency_key="order-2")
+    durable_app.close()
+    restarted = BookMyShow(journal_dir=journal_dir)  # snapshot + tail replay
+    print(f"Recovered bookings after restart: {sorted(restarted.bookings)}")
+    restarted.create_booking(City.DELHI, "BAAHUBALI", 13)  # should fail (sold before restart)
+    restarted.close()
+
+    actor_app = BookMyShow(ActorBookingEngine())
+    actor_app.create_booking(City.DELHI, "AVENGERS", 75)
+    actor_app.create_booking(City.DELHI, "AVENGERS", 75)  # should fail (already booked)
+    actor_app.booking_engine.stop()
+    app.close()
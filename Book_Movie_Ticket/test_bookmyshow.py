@@ -0,0 +1,186 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from bookmyshow import ActorBookingEngine, BookMyShow, City, Movie, Seat, SeatCategory, SeatHoldManager, Screen, Show, TimingWheel
+
+
+def build_screen(n_seats):
+    return Screen(1, [Seat(i, SeatCategory.SILVER if i < n_seats // 2 else SeatCategory.GOLD) for i in range(n_seats)])
+
+
+class SeatHoldTest(unittest.TestCase):
+    def test_concurrent_holds_expire_without_leaking(self):
+        n_holds, n_shows, n_threads, ttl = 6_000, 6, 6, 0.2
+        screen = build_screen(n_holds // n_shows)
+        shows = [Show(i, Movie(1, "AVENGERS", 128), screen, 10) for i in range(n_shows)]
+        manager = SeatHoldManager(TimingWheel(tick_seconds=0.01))
+        confirmed, failures = [0] * n_threads, []
+
+        def worker(tid):
+            for n in range(tid, n_holds, n_threads):
+                hold = manager.hold(shows[n % n_shows], [n // n_shows], ttl)
+                if hold is None:
+                    failures.append(n)
+                elif n % 10 == 0:
+                    confirmed[tid] += manager.confirm(hold)
+                elif n % 10 == 1:
+                    manager.release(hold)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        deadline = time.monotonic() + ttl + 5
+        while len(manager.wheel) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.stop()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(manager.wheel), 0)
+        self.assertEqual(sum(show.held_mask.bit_count() + len(show.holds) for show in shows), 0)
+        self.assertEqual(sum(show.booked_mask.bit_count() for show in shows), sum(confirmed))
+        for show in shows:
+            self.assertEqual(sum(show.free_by_category.values()), len(screen.layout) - show.booked_mask.bit_count())
+
+    def test_held_seat_cannot_be_booked_or_held_again(self):
+        show = Show(1, Movie(1, "AVENGERS", 128), build_screen(10), 10)
+        manager = SeatHoldManager()
+        hold = manager.hold(show, [3, 4], 60)
+        self.assertIsNotNone(hold)
+        self.assertFalse(show.book_seats([4]))
+        self.assertIsNone(manager.hold(show, [4, 5], 60))
+        self.assertTrue(manager.release(hold))
+        self.assertTrue(show.book_seats([4]))
+        manager.stop()
+
+
+class OptimisticBookingTest(unittest.TestCase):
+    def test_free_seats_are_never_rejected_under_contention(self):
+        show = Show(1, Movie(1, "AVENGERS", 128), build_screen(400), 10)
+        show.MAX_RETRIES = 1  # make retries run out quickly so the locked fallback is exercised
+        rejected = [0] * 8
+
+        def worker(tid):
+            for n in range(2_000):
+                seat = tid * 50 + n % 50  # each thread has its own seats: they are always free
+                if show.book_seats([seat]):
+                    show.cancel_seats([seat])
+                else:
+                    rejected[tid] += 1
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(sum(rejected), 0)
+        self.assertEqual(show.booked_mask, 0)
+
+
+class AvailabilitySnapshotTest(unittest.TestCase):
+    def test_snapshot_follows_changes_made_outside_actor_batches(self):
+        engine = ActorBookingEngine()
+        app = BookMyShow(engine)
+        try:
+            _, show = app.find_show(City.DELHI, "AVENGERS")
+            self.assertIsNotNone(app.book(show, [75], "order-75"))
+            self.assertFalse(engine.availability(show).is_available(75))
+            self.assertTrue(app.cancel_booking("order-75"))
+            self.assertTrue(show.is_seat_available(75))
+            self.assertTrue(engine.availability(show).is_available(75))
+
+            hold = app.hold_manager.hold(show, [76], 60)
+            self.assertFalse(engine.availability(show).is_available(76))
+            app.release_hold(hold)
+            self.assertTrue(engine.availability(show).is_available(76))
+            self.assertTrue(show.book_seats([77]))  # locked path, outside the actor
+            self.assertFalse(engine.availability(show).is_available(77))
+        finally:
+            engine.stop()
+            app.close()
+
+
+class BookMyShowLifecycleTest(unittest.TestCase):
+    def test_expiry_thread_starts_with_first_hold_and_stops_on_close(self):
+        app = BookMyShow()
+        self.assertIsNone(app.hold_manager._thread)
+        hold = app.hold_seats(City.BANGALORE, "AVENGERS", [41], ttl_seconds=0.05)
+        self.assertIsNotNone(hold)
+        thread = app.hold_manager._thread
+        self.assertTrue(thread.is_alive())
+        deadline = time.monotonic() + 5
+        while hold.show.held_mask and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(hold.show.is_seat_available(41))
+        app.close()
+        self.assertFalse(thread.is_alive())
+
+
+class FailingFile:
+    """Stands in for the journal file: every write fails like a full disk."""
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BookingJournalTest(unittest.TestCase):
+    def test_replayed_bookings_do_not_freeze_the_snapshot(self):
+        journal_dir = tempfile.mkdtemp()
+        app = BookMyShow(journal_dir=journal_dir)
+        _, show = app.find_show(City.DELHI, "AVENGERS")
+        self.assertIsNotNone(app.book(show, [75], "order-75"))
+        app.close()
+
+        engine = ActorBookingEngine()
+        app = BookMyShow(engine, journal_dir=journal_dir)
+        try:
+            _, show = app.find_show(City.DELHI, "AVENGERS")
+            self.assertFalse(engine.availability(show).is_available(75))
+            self.assertIsNotNone(app.book(show, [20], "order-20"))
+            self.assertFalse(engine.availability(show).is_available(20))
+        finally:
+            engine.stop()
+            app.close()
+
+    def test_failed_write_raises_in_every_waiter_instead_of_hanging(self):
+        app = BookMyShow(journal_dir=tempfile.mkdtemp())
+        _, show = app.find_show(City.DELHI, "AVENGERS")
+        app.journal.file = FailingFile()
+        errors = []
+
+        def worker(seat_id):
+            try:
+                app.book(show, [seat_id], f"order-{seat_id}")
+            except OSError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(seat_id,)) for seat_id in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        self.assertFalse(any(t.is_alive() for t in threads))
+        self.assertEqual(len(errors), 8)
+        self.assertEqual(app.bookings, {})
+        self.assertEqual(show.booked_mask, 0)  # never acknowledged, so the seats are free again
+        with self.assertRaises(OSError):
+            app.book(show, [9], "order-9")
+        app.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+# 📊 Calendar System benchmarks
+#
+# Usage:
+#   python benchmark.py              # run all benchmarks
+#   python benchmark.py conflicts    # run one benchmark by name
+
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from calendar_system import Calendar, Event, RecurrenceFactory, User, find_common_slots, free_busy
+from ical import export_calendar, import_calendar, read_events
+
+# ------------------ HELPERS ------------------
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6  # microseconds per call
+
+@contextlib.contextmanager
+def quiet():
+    # Calendar reports every change with print; keep it out of the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def history(owner, n_events, seed=1, start=datetime(2015, 1, 1)):
+    """n one-off meetings on distinct 30-minute slots of a working day, years back from start."""
+    rng = random.Random(seed)
+    slots = rng.sample(range(n_events * 2), n_events)
+    events = []
+    for slot in slots:
+        day, half_hour = divmod(slot, 16)  # 16 half-hour slots from 09:00
+        begin = start + timedelta(days=day, hours=9, minutes=30 * half_hour)
+        events.append(Event(f"Meeting {slot}", begin, begin + timedelta(minutes=30), owner))
+    return events
+
+# ------------------ BENCHMARKS ------------------
+def bench_conflicts(n_events=200_000, probes=2_000, seed=2):
+    """create_event / find_conflicts on a power user's history: list scan vs interval index."""
+    print(f"== Conflict detection: {n_events:,} events of history ==")
+    user = User("U1", "Power User")
+    events = history(user, n_events)
+    calendar = Calendar(user)
+    with quiet():
+        started = time.perf_counter()
+        for event in events:
+            calendar.create_event(event)
+        build = time.perf_counter() - started
+    assert len(calendar.index) == n_events
+
+    rng = random.Random(seed)
+    first, last = min(e.start for e in events), max(e.end for e in events)
+    span = int((last - first).total_seconds() // 60)
+
+    def probe():
+        begin = first + timedelta(minutes=rng.randrange(span))
+        return Event("Probe", begin, begin + timedelta(minutes=rng.choice((15, 60, 240))), user)
+
+    probe_events = [probe() for _ in range(probes)]
+    flat = list(calendar.index)
+
+    def linear():
+        new_event = rng.choice(probe_events)
+        return [e for e in flat if not (new_event.end <= e.start or new_event.start >= e.end)]
+
+    def indexed():
+        return calendar.find_conflicts(rng.choice(probe_events))
+
+    for new_event in probe_events[:200]:
+        expected = [e for e in flat if not (new_event.end <= e.start or new_event.start >= e.end)]
+        assert calendar.find_conflicts(new_event) == expected
+
+    victims = rng.sample(events, 10_000)
+    started = time.perf_counter()
+    with quiet():
+        for event in victims:
+            calendar.delete_event(event)
+    delete_us = (time.perf_counter() - started) / len(victims) * 1e6
+
+    print(f"create_event (index)  {build / n_events * 1e6:>10,.1f} us/event")
+    print(f"conflicts: list scan  {timed(linear, 20):>10,.1f} us")
+    print(f"conflicts: index      {timed(indexed, probes):>10,.1f} us")
+    print(f"delete_event (index)  {delete_us:>10,.1f} us")
+
+def random_series(owner, n_series, seed=3, start=datetime(2025, 1, 6)):
+    """Open-ended, mostly monthly and weekly series at minute granularity between 07:00 and 21:00."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n_series):
+        begin = start + timedelta(days=rng.randrange(60), minutes=rng.randrange(7 * 60, 21 * 60))
+        duration = timedelta(minutes=rng.choice((5, 10, 15)))
+        recurrence = rng.choices(("DAILY", "WEEKLY", "MONTHLY"), (1, 3, 6))[0]
+        events.append(Event(f"Series {i}", begin, begin + duration, owner, recurrence=recurrence))
+    return events
+
+def bench_series(n_series=5_000, probes=20, horizon_days=365):
+    """Creating open-ended series: rule-based conflict checks vs materializing a year of occurrences."""
+    print(f"== Recurring series: {n_series:,} open-ended series ==")
+    user = User("U1", "Busy User")
+    calendar = Calendar(user)
+    candidates = random_series(user, n_series)
+    with quiet():
+        started = time.perf_counter()
+        accepted = sum(calendar.create_event(event) for event in candidates)
+        build = time.perf_counter() - started
+    print(f"create_event (rules)      {build / n_series * 1e6:>10,.1f} us/series ({accepted:,} accepted)")
+
+    factory = RecurrenceFactory()
+    stored = list(calendar.series)
+
+    def expand(series, start, end):
+        return [(o.start, o.end) for o in factory.get_strategy(series.recurrence).occurrences(series, start, end)]
+
+    def materialized(new_event):
+        # Baseline: every occurrence in the horizon, new series against each stored one
+        start = new_event.start
+        end = start + timedelta(days=horizon_days)
+        mine = expand(new_event, start, end)
+        for series in stored:
+            theirs = expand(series, start, end)
+            i = j = 0
+            while i < len(mine) and j < len(theirs):
+                if mine[i][0] < theirs[j][1] and theirs[j][0] < mine[i][1]:
+                    return True
+                if mine[i][1] <= theirs[j][1]:
+                    i += 1
+                else:
+                    j += 1
+        return False
+
+    probe_events = random_series(user, probes, seed=4)
+    started = time.perf_counter()
+    expected = [materialized(event) for event in probe_events]
+    baseline = (time.perf_counter() - started) / probes * 1e6
+    started = time.perf_counter()
+    got = [calendar.has_conflict(event) for event in probe_events]
+    rules = (time.perf_counter() - started) / probes * 1e6
+    assert got == expected
+    print(f"has_conflict: {horizon_days}-day expansion {baseline:>10,.1f} us")
+    print(f"has_conflict: rules             {rules:>10,.1f} us")
+
+    week = (datetime(2025, 9, 1), datetime(2025, 9, 8))
+    count = sum(1 for _ in calendar.occurrences(*week))
+    print(f"expand one week of agenda  {timed(lambda: sum(1 for _ in calendar.occurrences(*week)), 5) / 1e3:>9,.1f} ms "
+          f"({count:,} occurrences)")
+
+def bench_agenda(n_events=200_000, n_series=300, queries=500, seed=5):
+    """DAILY/WEEKLY/MONTHLY agendas: full scan vs index + lazy expansion vs cached windows."""
+    print(f"== Agenda windows: {n_events:,} events + {n_series} series ==")
+    user = User("U1", "Power User")
+    calendar = Calendar(user)
+    events = history(user, n_events, start=datetime(2020, 1, 1))
+    with quiet():
+        for event in events:
+            calendar.create_event(event)
+        for event in random_series(user, n_series, start=datetime(2024, 1, 1)):
+            calendar.create_event(event)
+    rng = random.Random(seed)
+    moments = [datetime(2024, 1, 1) + timedelta(days=rng.randrange(365), minutes=rng.randrange(1440))
+               for _ in range(queries)]
+    flat = list(calendar.index)
+    period, span = "WEEKLY", timedelta(weeks=1)
+
+    def scan():
+        now = rng.choice(moments)
+        window = [e for e in flat if now <= e.start < now + span]
+        window += [o for o in calendar.occurrences(now, now + span) if o.start >= now]
+        return sorted(window, key=lambda event: event.start)
+
+    def indexed():
+        now = rng.choice(moments)
+        return list(calendar.agenda(now, now + span))
+
+    now = moments[0]
+    assert [e.start for e in calendar.list_events(period, now)] == [e.start for e in calendar.agenda(now, now + span)]
+
+    def cached():
+        return list(calendar.list_events(period, now))
+
+    # One edit per round: evicts only the windows it touches, the other windows stay warm
+    hot = [moments[i] for i in range(8)]
+    for moment in hot:
+        list(calendar.list_events(period, moment))
+    probe = events[-1]
+
+    def edit_and_read():
+        with quiet():
+            calendar.update_event(probe, title="Moved")
+        return [list(calendar.list_events(period, moment)) for moment in hot]
+
+    print(f"{period} agenda: full scan       {timed(scan, 5) / 1e3:>9,.2f} ms")
+    print(f"{period} agenda: index + merge   {timed(indexed, 200) / 1e3:>9,.2f} ms")
+    print(f"{period} agenda: cached window   {timed(cached, 2000) / 1e3:>9,.3f} ms")
+    print(f"edit + re-read {len(hot)} cached windows {timed(edit_and_read, 200) / 1e3:>9,.3f} ms")
+
+def dense_user(user_id, rng, first_day, days, per_day=2, n_series=1):
+    """Half-hour meetings on a 30-minute grid between 08:00 and 20:00, plus a few weekly series."""
+    user = User(user_id, user_id)
+    with quiet():
+        for series in range(n_series):
+            begin = first_day + timedelta(days=rng.randrange(7), minutes=30 * rng.randrange(16, 40))
+            user.calendar.create_event(Event(f"Weekly {series}", begin, begin + timedelta(minutes=30), user, "WEEKLY"))
+        for day in range(days):
+            for slot in rng.sample(range(16, 40), per_day):
+                begin = first_day + timedelta(days=day, minutes=30 * slot)
+                user.calendar.create_event(Event("Meeting", begin, begin + timedelta(minutes=30), user))
+    return user
+
+def bench_free_busy(n_users=50, days=60, seed=6, probe_step=timedelta(minutes=30)):
+    """find_common_slots for 50 dense calendars: probing every user per candidate slot vs k-way sweep."""
+    print(f"== Common slots: {n_users} participants, {days} days ==")
+    rng = random.Random(seed)
+    first_day = datetime(2025, 3, 3)
+    users = [dense_user(f"U{i}", rng, first_day, days) for i in range(n_users)]
+    window = (first_day, first_day + timedelta(days=days))
+    duration, working_hours = timedelta(minutes=30), (8, 20)
+
+    def probing():
+        # Baseline: walk candidate starts and ask every calendar whether it is free
+        slots, start = [], window[0]
+        while start + duration <= window[1] and len(slots) < 5:
+            day = start.replace(hour=0, minute=0)
+            if day + timedelta(hours=working_hours[0]) <= start and start + duration <= day + timedelta(hours=working_hours[1]):
+                probe = Event("Probe", start, start + duration, users[0])
+                if not any(user.calendar.has_conflict(probe) for user in users):
+                    slots.append((start, start + duration))
+                    start += duration
+                    continue
+            start += probe_step
+        return slots
+
+    def sweep():
+        return find_common_slots(users, duration, window, limit=5, working_hours=working_hours)
+
+    found = sweep()
+    for start, end in found:
+        probe = Event("Probe", start, end, users[0])
+        assert not any(user.calendar.has_conflict(probe) for user in users)
+    assert [start for start, _ in probing()] == [start for start, _ in found]
+    merged = sum(1 for _ in free_busy(users, *window))
+    print(f"earliest slots: {', '.join(f'{start:%m-%d %H:%M}' for start, _ in found)}")
+    print(f"probe every calendar   {timed(probing, 1) / 1e3:>9,.1f} ms")
+    print(f"k-way sweep            {timed(sweep, 10) / 1e3:>9,.1f} ms")
+    print(f"full {days}-day free/busy  {timed(lambda: sum(1 for _ in free_busy(users, *window)), 3) / 1e3:>9,.1f} ms "
+          f"({merged:,} merged busy blocks)")
+
+def bench_ical(n_events=200_000, n_series=500):
+    """iCalendar export and import (events/sec): create_event per event vs streaming bulk load."""
+    print(f"== iCalendar: {n_events:,} events + {n_series} series ==")
+    user = User("U1", "Power User")
+    source = Calendar(user)
+    events = history(user, n_events)
+    source.bulk_load(events)
+    series_start = max(event.end for event in events)  # history in the past, series from now on
+    with quiet():
+        for event in random_series(user, n_series, start=series_start):
+            source.create_event(event)
+    total = len(source.index) + len(source.series)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calendar.ics")
+        started = time.perf_counter()
+        export_calendar(source, path)
+        export_s = time.perf_counter() - started
+        size = os.path.getsize(path)
+
+        target = Calendar(User("U2", "One by one"))
+        started = time.perf_counter()
+        with quiet():
+            for event in read_events(path, target.user):
+                target.create_event(event)
+        one_by_one = time.perf_counter() - started
+
+        target = Calendar(User("U3", "Bulk"))
+        started = time.perf_counter()
+        loaded = import_calendar(target, path)
+        bulk = time.perf_counter() - started
+
+    assert loaded == total and len(target.index) + len(target.series) == total
+    window = (series_start, series_start + timedelta(days=31))
+    assert [(e.title, e.start, e.end) for e in source.agenda(*window)] == \
+           [(e.title, e.start, e.end) for e in target.agenda(*window)]
+    print(f"file: {size / 2**20:.1f} MiB")
+    print(f"export                  {total / export_s:>10,.0f} events/s")
+    print(f"import: create_event    {total / one_by_one:>10,.0f} events/s")
+    print(f"import: bulk load       {total / bulk:>10,.0f} events/s")
+
+
+BENCHMARKS = {
+    "conflicts": bench_conflicts,
+    "series": bench_series,
+    "agenda": bench_agenda,
+    "free_busy": bench_free_busy,
+    "ical": bench_ical,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -6,8 +6,14 @@
 # 4. Check conflicts
 # 5. List daily/weekly/monthly agenda
 
+import bisect
+import heapq
+import random
 from abc import ABC, abstractmethod
+from calendar import monthrange
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from math import gcd
 
 # -------------------- Models --------------------
 class User:
@@ -17,94 +23,674 @@ class User:
         self.calendar = Calendar(self)
 
 class Event:
-    def __init__(self, title: str, start: datetime, end: datetime, owner: User, recurrence: str = None):
+    def __init__(self, title: str, start: datetime, end: datetime, owner: User, recurrence: str = None,
+                 until: datetime = None, uid: str = None):
+        self.uid = uid  # stable identifier for sync (iCalendar UID)
         self.title = title
         self.start = start
         self.end = end
         self.owner = owner
         self.participants = [owner]
         self.recurrence = recurrence  # e.g. "DAILY", "WEEKLY", None
+        self.until = until  # recurring events: no occurrence starts at or after this (None = open-ended)
+        self.invitees = []  # invited, not yet accepted
+
+    def invite(self, user: User):
+        if user not in self.participants and user not in self.invitees:
+            self.invitees.append(user)
 
     def add_participant(self, user: User):
-        if user not in self.participants:
-            self.participants.append(user)
+        """Invites and accepts on the user's behalf: the event lands on their calendar too."""
+        self.invite(user)
+        return user.calendar.accept_invite(self)
 
     def remove_participant(self, user: User):
-        if user in self.participants:
+        if user in self.participants and user is not self.owner:
             self.participants.remove(user)
+            if self in user.calendar:
+                user.calendar._detach(self)
+
+class Occurrence:
+    """One instance of a recurring event, produced lazily inside a query window."""
+    __slots__ = ("series", "start", "end")
+
+    def __init__(self, series: Event, start: datetime, end: datetime):
+        self.series = series
+        self.start = start
+        self.end = end
+
+    @property
+    def title(self):
+        return self.series.title
+
+    def __repr__(self):
+        return f"Occurrence({self.series.title!r}, {self.start:%Y-%m-%d %H:%M})"
+
+
+# -------------------- Interval Index --------------------
+class _IntervalNode:
+    __slots__ = ("key", "event", "end", "max_end", "priority", "left", "right")
+
+    def __init__(self, key, event, priority):
+        self.key = key  # (start, seq): unique and ordered by start
+        self.event = event
+        self.end = self.max_end = event.end
+        self.priority = priority
+        self.left = self.right = None
+
+class IntervalIndex:
+    """Events ordered by start in a treap augmented with the max end of each subtree.
+
+    Expected O(log n) insert/remove; overlap queries cost O(log n + k) for k hits
+    because subtrees whose max end is before the query start are skipped.
+    """
+
+    def __init__(self, seed=None):
+        self.root = None
+        self.keys = {}  # event -> key of its node
+        self._seq = 0
+        self._rng = random.Random(seed)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, event):
+        return event in self.keys
+
+    def __iter__(self):
+        return self.overlapping(datetime.min, datetime.max)
+
+    @staticmethod
+    def _update(node):
+        node.max_end = node.end
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    def _split(self, node, key):
+        # -> (keys < key, keys >= key)
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self._split(node.right, key)
+            self._update(node)
+            return node, right
+        left, node.left = self._split(node.left, key)
+        self._update(node)
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None or right is None:
+            return left or right
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            self._update(left)
+            return left
+        right.left = self._merge(left, right.left)
+        self._update(right)
+        return right
+
+    def insert(self, event):
+        if event in self.keys:
+            return False
+        self._seq += 1
+        key = self.keys[event] = (event.start, self._seq)
+        new = _IntervalNode(key, event, self._rng.random())
+        parent, node, went_left = None, self.root, False
+        while node is not None and node.priority > new.priority:
+            if event.end > node.max_end:
+                node.max_end = event.end
+            parent, went_left = node, key < node.key
+            node = node.left if went_left else node.right
+        new.left, new.right = self._split(node, key)
+        self._update(new)
+        if parent is None:
+            self.root = new
+        elif went_left:
+            parent.left = new
+        else:
+            parent.right = new
+        return True
+
+    def bulk_load(self, events):
+        """Adds many events at once: one sort, then a linear Cartesian-tree build of the treap."""
+        entries = [(node.key, node.event) for node in self._nodes()]
+        for event in events:
+            if event not in self.keys:
+                self._seq += 1
+                key = self.keys[event] = (event.start, self._seq)
+                entries.append((key, event))
+        entries.sort(key=lambda entry: entry[0])
+        rng, spine = self._rng, []  # spine: right spine of the tree built so far
+        for key, event in entries:
+            node = _IntervalNode(key, event, rng.random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        self.root = spine[0] if spine else None
+        for node in reversed(list(self._nodes(preorder=True))):  # children before parents
+            self._update(node)
+
+    def _nodes(self, preorder=False):
+        if preorder:
+            stack = [self.root] if self.root is not None else []
+            while stack:
+                node = stack.pop()
+                yield node
+                stack.extend(child for child in (node.right, node.left) if child is not None)
+            return
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def remove(self, event):
+        key = self.keys.pop(event, None)
+        if key is None:
+            return False
+        path, node = [], self.root
+        while node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        replacement = self._merge(node.left, node.right)
+        if not path:
+            self.root = replacement
+        elif path[-1].left is node:
+            path[-1].left = replacement
+        else:
+            path[-1].right = replacement
+        for ancestor in reversed(path):
+            self._update(ancestor)
+        return True
+
+    def starting(self, lo: datetime, hi: datetime):
+        """Yields events with lo <= start < hi in start order (descends like a bisect, then walks in order)."""
+        stack, node = [], self.root
+        while node is not None:
+            if node.key[0] >= lo:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            if node.key[0] >= hi:
+                return
+            yield node.event
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def overlapping(self, start: datetime, end: datetime):
+        """Yields events with event.start < end and event.end > start, in start order."""
+        stack, node = [], self.root
+        while True:
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key[0] >= end:
+                return
+            if node.end > start:
+                yield node.event
+            node = node.right
 
 
 # -------------------- Calendar --------------------
+REFERENCE_DAY = datetime(2000, 1, 1)
+ONE_DAY = timedelta(days=1)
+
+class _TimeOfDaySlot:
+    __slots__ = ("series", "start", "end")
+
+    def __init__(self, series: Event, start: datetime, end: datetime):
+        self.series = series
+        self.start = start
+        self.end = end
+
+def time_of_day_slots(start: datetime, end: datetime):
+    """Projects [start, end) onto REFERENCE_DAY; wraps past midnight into a second slot."""
+    if end - start >= ONE_DAY:
+        return [(REFERENCE_DAY, REFERENCE_DAY + ONE_DAY)]
+    begin = REFERENCE_DAY + (start - start.replace(hour=0, minute=0, second=0, microsecond=0))
+    finish = begin + (end - start)
+    if finish <= REFERENCE_DAY + ONE_DAY:
+        return [(begin, finish)]
+    return [(begin, REFERENCE_DAY + ONE_DAY), (REFERENCE_DAY, finish - ONE_DAY)]
+
+class AgendaCache:
+    """Materialized agenda windows (LRU). A change only evicts the windows it lands in."""
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self.windows = OrderedDict()  # (start, end) -> (starts, events), both sorted by start
+
+    def get(self, window):
+        entry = self.windows.get(window)
+        if entry is not None:
+            self.windows.move_to_end(window)
+        return entry
+
+    def put(self, window, events):
+        self.windows[window] = ([event.start for event in events], events)
+        if len(self.windows) > self.capacity:
+            self.windows.popitem(last=False)
+
+    def invalidate(self, touches):
+        for window in [window for window in self.windows if touches(*window)]:
+            del self.windows[window]
+
+AGENDA_PERIODS = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1), "MONTHLY": timedelta(days=30)}
+
 class Calendar:
     def __init__(self, user: User):
         self.user = user
-        self.events = []  # List[Event]
+        self.index = IntervalIndex()  # one-off events, ordered by start
+        # Recurring events are kept as rules and expanded lazily. Every rule steps in whole days,
+        # so two events can only collide if their times of day overlap: series_slots indexes each
+        # series projected onto one reference day and prefilters conflict candidates.
+        self.series = {}  # recurring event -> its _TimeOfDaySlots
+        self.series_slots = IntervalIndex()
+        self.recurrences = RecurrenceFactory()
+        self.agenda_cache = AgendaCache()
+
+    @property
+    def events(self):
+        return sorted([*self.index, *self.series], key=lambda event: event.start)
+
+    def __contains__(self, event: Event):
+        return event in self.series or event in self.index
 
     def create_event(self, event: Event):
         if self.has_conflict(event):
             print("❌ Conflict Detected. Event not added.")
             return False
-        self.events.append(event)
+        self._attach(event)
         print(f"✅ Event '{event.title}' added to calendar of {self.user.name}")
         return True
 
+    def bulk_load(self, events):
+        """Loads events without conflict checks or per-event output (imports, migrations); returns the count.
+
+        All-or-nothing: `events` is drained before anything is attached, so an error part way
+        through (e.g. a bad line in an imported file) leaves the calendar unchanged.
+        """
+        one_offs, series = [], []
+        for event in events:
+            (series if event.recurrence else one_offs).append(event)
+        for event in series:
+            self._attach(event)
+        self.index.bulk_load(one_offs)
+        self.agenda_cache.windows.clear()
+        return len(one_offs) + len(series)
+
+    def accept_invite(self, event: Event):
+        """Places a shared event on this calendar (conflict-checked) and joins its participants."""
+        if self.user in event.participants and event in self:
+            return True
+        if self.user not in event.invitees:
+            print(f"❌ {self.user.name} has no pending invite to '{event.title}'.")
+            return False
+        if event not in event.owner.calendar:
+            print(f"❌ '{event.title}' is not on {event.owner.name}'s calendar.")
+            return False
+        if self.has_conflict(event):
+            print(f"❌ Conflict Detected. {self.user.name} cannot accept '{event.title}'.")
+            return False
+        event.invitees.remove(self.user)
+        event.participants.append(self.user)
+        self._attach(event)
+        print(f"✅ {self.user.name} accepted '{event.title}'")
+        return True
+
+    def decline_invite(self, event: Event):
+        if self.user in event.invitees:
+            event.invitees.remove(self.user)
+
+    def update_event(self, event: Event, **changes):
+        """Edits title/start/end/recurrence/until on every participant's calendar; rolled back on any conflict."""
+        if event not in self:
+            return False
+        calendars = [user.calendar for user in event.participants if event in user.calendar]
+        previous = {field: getattr(event, field) for field in changes}
+        for calendar in calendars:
+            calendar._detach(event)
+        for field, value in changes.items():
+            setattr(event, field, value)
+        if any(calendar.has_conflict(event) for calendar in calendars):
+            for field, value in previous.items():
+                setattr(event, field, value)
+            for calendar in calendars:
+                calendar._attach(event)
+            print("❌ Conflict Detected. Event not updated.")
+            return False
+        for calendar in calendars:
+            calendar._attach(event)
+        print(f"✏️ Event '{event.title}' updated")
+        return True
+
     def delete_event(self, event: Event):
-        if event in self.events:
-            self.events.remove(event)
-            print(f"🗑️ Event '{event.title}' deleted from calendar")
+        """The owner deletes the event for everyone; a participant only leaves it."""
+        if event not in self:
+            return
+        if event.owner is not self.user:
+            event.remove_participant(self.user)
+            print(f"🚪 {self.user.name} left '{event.title}'")
+            return
+        for user in event.participants:
+            if event in user.calendar:
+                user.calendar._detach(event)
+        print(f"🗑️ Event '{event.title}' deleted from calendar")
 
-    def has_conflict(self, new_event: Event):
-        for event in self.events:
-            if not (new_event.end <= event.start or new_event.start >= event.end):
-                return True
-        return False
-
-    def list_events(self, period: str = "DAILY"):
-        now = datetime.now()
-        if period == "DAILY":
-            window_end = now + timedelta(days=1)
-        elif period == "WEEKLY":
-            window_end = now + timedelta(weeks=1)
-        elif period == "MONTHLY":
-            window_end = now + timedelta(days=30)
+    def _attach(self, event: Event):
+        if event.recurrence:
+            slots = [_TimeOfDaySlot(event, start, end) for start, end in time_of_day_slots(event.start, event.end)]
+            for slot in slots:
+                self.series_slots.insert(slot)
+            self.series[event] = slots
         else:
-            print("Unknown period.")
+            self.index.insert(event)
+        self._invalidate(event)
+
+    def _detach(self, event: Event):
+        self._invalidate(event)
+        slots = self.series.pop(event, None)
+        if slots is None:
+            self.index.remove(event)
+            return
+        for slot in slots:
+            self.series_slots.remove(slot)
+
+    def _invalidate(self, event: Event):
+        # Evict cached windows in which the event (or one of its occurrences) starts
+        if not event.recurrence:
+            self.agenda_cache.invalidate(lambda start, end: start <= event.start < end)
             return
+        rule = self.recurrences.get_strategy(event.recurrence)
+        self.agenda_cache.invalidate(lambda start, end: any(
+            occurrence.start >= start for occurrence in rule.occurrences(event, start, end)))
+
+    def _series_candidates(self, start: datetime, end: datetime):
+        seen = set()
+        for slot_start, slot_end in time_of_day_slots(start, end):
+            for slot in self.series_slots.overlapping(slot_start, slot_end):
+                if slot.series not in seen:
+                    seen.add(slot.series)
+                    yield slot.series
+
+    def _conflicts(self, new_event: Event):
+        # One-off events, occurrences or whole series that collide with new_event
+        if not new_event.recurrence:
+            for event in self.index.overlapping(new_event.start, new_event.end):
+                if event is not new_event:
+                    yield event
+            for series in self._series_candidates(new_event.start, new_event.end):
+                rule = self.recurrences.get_strategy(series.recurrence)
+                occurrence = next(rule.occurrences(series, new_event.start, new_event.end), None)
+                if occurrence is not None and series is not new_event:
+                    yield occurrence
+            return
+        rule = self.recurrences.get_strategy(new_event.recurrence)
+        horizon = datetime.max if new_event.until is None else new_event.until + (new_event.end - new_event.start)
+        for event in self.index.overlapping(new_event.start, horizon):
+            if next(rule.occurrences(new_event, event.start, event.end), None) is not None:
+                yield event
+        for series in self._series_candidates(new_event.start, new_event.end):
+            if series is not new_event and series_conflict(
+                    new_event, rule, series, self.recurrences.get_strategy(series.recurrence)):
+                yield series
+
+    def find_conflicts(self, new_event: Event):
+        return list(self._conflicts(new_event))
+
+    def has_conflict(self, new_event: Event):
+        return next(self._conflicts(new_event), None) is not None
+
+    def occurrences(self, window_start: datetime, window_end: datetime):
+        """Occurrences of every recurring event overlapping [window_start, window_end)."""
+        for series in self.series:
+            yield from self.recurrences.get_strategy(series.recurrence).occurrences(series, window_start, window_end)
+
+    def agenda(self, window_start: datetime, window_end: datetime):
+        """Events and occurrences starting in [window_start, window_end), lazily, in start order."""
+        streams = [self.index.starting(window_start, window_end)]
+        for series in self.series:
+            rule = self.recurrences.get_strategy(series.recurrence)
+            streams.append(occurrence for occurrence in rule.occurrences(series, window_start, window_end)
+                           if occurrence.start >= window_start)
+        return heapq.merge(*streams, key=lambda event: event.start)
+
+    def list_events(self, period: str = "DAILY", now: datetime = None):
+        """Iterator over the agenda from now for the period, served from the cached day-aligned window."""
+        span = AGENDA_PERIODS.get(period)
+        if span is None:
+            print("Unknown period.")
+            return iter(())
+        now = now or datetime.now()
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        window = (day, day + span + ONE_DAY)  # covers [now, now + span) for any time of day
+        entry = self.agenda_cache.get(window)
+        if entry is None:
+            self.agenda_cache.put(window, tuple(self.agenda(*window)))
+            entry = self.agenda_cache.get(window)
+        starts, events = entry
+        lo, hi = bisect.bisect_left(starts, now), bisect.bisect_left(starts, now + span)
+        return iter(events[lo:hi])
+
+    def busy(self, window_start: datetime, window_end: datetime):
+        """This user's busy intervals overlapping the window, as (start, end) ordered by start."""
+        streams = [((event.start, event.end) for event in self.index.overlapping(window_start, window_end))]
+        for series in self.series:
+            rule = self.recurrences.get_strategy(series.recurrence)
+            streams.append((occurrence.start, occurrence.end)
+                           for occurrence in rule.occurrences(series, window_start, window_end))
+        return heapq.merge(*streams)
+
+# -------------------- Free/Busy --------------------
+def off_hours(window_start: datetime, window_end: datetime, working_hours):
+    """Busy blocks outside [start_hour, end_hour) on every day of the window, clipped to the window."""
+    start_hour, end_hour = working_hours
+    day = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < window_end:
+        for start, end in ((day, day + timedelta(hours=start_hour)), (day + timedelta(hours=end_hour), day + ONE_DAY)):
+            start, end = max(start, window_start), min(end, window_end)
+            if start < end:
+                yield start, end
+        day += ONE_DAY
+
+def free_busy(users, window_start: datetime, window_end: datetime, working_hours=None):
+    """Merged busy intervals of all users: a k-way sweep over each calendar's ordered busy stream."""
+    streams = [user.calendar.busy(window_start, window_end) for user in users]
+    if working_hours is not None:
+        streams.append(off_hours(window_start, window_end, working_hours))
+    current_start = current_end = None
+    for start, end in heapq.merge(*streams):
+        if current_end is not None and start <= current_end:
+            if end > current_end:
+                current_end = end
+            continue
+        if current_end is not None:
+            yield from _clipped(current_start, current_end, window_start, window_end)
+        current_start, current_end = start, end
+    if current_end is not None:
+        yield from _clipped(current_start, current_end, window_start, window_end)
 
-        print(f"\n📅 {period} agenda for {self.user.name}:")
-        for event in self.events:
-            if now <= event.start <= window_end:
-                print(f"- {event.title}: {event.start.strftime('%Y-%m-%d %H:%M')}")
+def _clipped(start, end, window_start, window_end):
+    start, end = max(start, window_start), min(end, window_end)
+    if start < end:
+        yield start, end
+
+def find_common_slots(users, duration: timedelta, window, limit: int = 5, working_hours=None):
+    """Earliest [start, start + duration) slots (one per free gap) when every user is free."""
+    window_start, window_end = window
+    slots, cursor = [], window_start
+    busy = free_busy(users, window_start, window_end, working_hours)
+    for start, end in busy:
+        if start - cursor >= duration:
+            slots.append((cursor, cursor + duration))
+            if len(slots) == limit:
+                return slots
+        cursor = max(cursor, end)
+    if window_end - cursor >= duration and len(slots) < limit:
+        slots.append((cursor, cursor + duration))
+    return slots
+
+# -------------------- Rendering --------------------
+def render_agenda(title: str, events):
+    lines = [f"\n📅 {title}:"]
+    lines += [f"- {event.title}: {event.start.strftime('%Y-%m-%d %H:%M')}" for event in events]
+    return "\n".join(lines)
 
 # -------------------- Recurrence Strategy (Decorator-like) --------------------
+US = timedelta(microseconds=1)
+
 class RecurrenceStrategy(ABC):
+    # Conflict checks reason about start offsets modulo this step
+    step: timedelta = None
+    spacing: timedelta = None  # typical gap between consecutive starts
+
     @abstractmethod
-    def get_next_occurrence(self, event: Event):
+    def nth_start(self, anchor: datetime, n: int) -> datetime:
         pass
 
-class DailyRecurrence(RecurrenceStrategy):
-    def get_next_occurrence(self, event: Event):
-        return Event(event.title, event.start + timedelta(days=1), event.end + timedelta(days=1), event.owner, event.recurrence)
+    @abstractmethod
+    def index_at(self, anchor: datetime, moment: datetime) -> int:
+        """A lower bound on the index of the last occurrence starting at or before moment."""
 
-class WeeklyRecurrence(RecurrenceStrategy):
     def get_next_occurrence(self, event: Event):
-        return Event(event.title, event.start + timedelta(weeks=1), event.end + timedelta(weeks=1), event.owner, event.recurrence)
+        start = self.nth_start(event.start, 1)
+        return Event(event.title, start, start + (event.end - event.start), event.owner, event.recurrence)
+
+    def occurrences(self, series: Event, window_start: datetime, window_end: datetime):
+        """Lazily yields the series' occurrences overlapping [window_start, window_end), in order."""
+        duration = series.end - series.start
+        n = 0 if window_start <= series.start else max(0, self.index_at(series.start, window_start - duration))
+        try:
+            while True:
+                start = self.nth_start(series.start, n)
+                if start >= window_end or (series.until is not None and start >= series.until):
+                    return
+                if start + duration > window_start:
+                    yield Occurrence(series, start, start + duration)
+                n += 1
+        except (OverflowError, ValueError):  # stepped past datetime.max
+            return
+
+class FixedPeriodRecurrence(RecurrenceStrategy):
+    def __init__(self, period: timedelta):
+        self.period = self.step = self.spacing = period
+
+    def nth_start(self, anchor: datetime, n: int):
+        return anchor + n * self.period
+
+    def index_at(self, anchor: datetime, moment: datetime):
+        return (moment - anchor) // self.period
+
+class DailyRecurrence(FixedPeriodRecurrence):
+    def __init__(self):
+        super().__init__(timedelta(days=1))
+
+class WeeklyRecurrence(FixedPeriodRecurrence):
+    def __init__(self):
+        super().__init__(timedelta(weeks=1))
 
 class MonthlyRecurrence(RecurrenceStrategy):
-    def get_next_occurrence(self, event: Event):
-        return Event(event.title, event.start + timedelta(days=30), event.end + timedelta(days=30), event.owner, event.recurrence)
+    # Same day of month (clipped to short months), same time of day. Over the years the starts
+    # land on every weekday, so against a fixed grid only the one-day step is invariant.
+    step = ONE_DAY
+    spacing = timedelta(days=30)
+
+    def nth_start(self, anchor: datetime, n: int):
+        year, month = divmod(anchor.month - 1 + n, 12)
+        year += anchor.year
+        return anchor.replace(year=year, month=month + 1, day=min(anchor.day, monthrange(year, month + 1)[1]))
+
+    def index_at(self, anchor: datetime, moment: datetime):
+        return (moment.year - anchor.year) * 12 + moment.month - anchor.month - 1
+
+# Month lengths (incl. February 28/29) repeat within four years: enough to compare two monthly rules
+MONTHLY_CYCLE = timedelta(days=4 * 366)
+
+# Lengths of consecutive months (a month and the one after it) that occur in the calendar
+CONSECUTIVE_MONTHS = ((31, 28), (31, 29), (28, 31), (29, 31), (31, 30), (30, 31), (31, 31))
+
+def _monthly_pair_conflict(a: Event, b: Event):
+    # Occurrences more than a month apart are over 27 days apart, so only pairs in the same
+    # month (for each month length) or in neighbouring months can overlap.
+    duration_a, duration_b = a.end - a.start, b.end - b.start
+    day_a, day_b = a.start.day, b.start.day
+    time_shift = (b.start - b.start.replace(hour=0, minute=0, second=0, microsecond=0)) - \
+                 (a.start - a.start.replace(hour=0, minute=0, second=0, microsecond=0))
+    offsets = [min(day_b, length) - min(day_a, length) for length in (28, 29, 30, 31)]
+    for first, second in CONSECUTIVE_MONTHS:
+        offsets.append(first - min(day_a, first) + min(day_b, second))  # b in the month after a
+        offsets.append(-(first - min(day_b, first) + min(day_a, second)))  # b in the month before a
+    return any(-duration_b < timedelta(days=days) + time_shift < duration_a for days in offsets)
+
+def series_conflict(a: Event, rule_a: RecurrenceStrategy, b: Event, rule_b: RecurrenceStrategy):
+    """Whether two recurring events ever overlap, decided from their rules.
+
+    Starts of a and b differ by (b.start - a.start) + j*step_b - i*step_a, which for long enough
+    series takes every value of that offset modulo gcd(step_a, step_b); they collide iff some such
+    value lies in (-duration_b, duration_a). Two monthly rules compare their day-of-month offsets
+    for every month length. Bounded series that end before the pattern has fully played out are
+    swept occurrence by occurrence over that finite span.
+    """
+    duration_a, duration_b = a.end - a.start, b.end - b.start
+    later = max(a.start, b.start)
+    bounds = [series.until for series in (a, b) if series.until is not None]
+    analytic = False
+    fixed_a, fixed_b = isinstance(rule_a, FixedPeriodRecurrence), isinstance(rule_b, FixedPeriodRecurrence)
+    if fixed_a and fixed_b:
+        step_a, step_b = rule_a.step // US, rule_b.step // US
+        cycle = timedelta(microseconds=step_a * step_b // gcd(step_a, step_b))
+        analytic = not bounds or min(bounds) >= later + cycle + max(duration_a, duration_b)
+    elif fixed_a or fixed_b:
+        analytic = not bounds
+    elif not bounds and max(duration_a, duration_b) <= timedelta(days=27):
+        return _monthly_pair_conflict(a, b)
+    if analytic:
+        grid = gcd(rule_a.step // US, rule_b.step // US)
+        offset = ((b.start - a.start) // US) % grid
+        return offset < duration_a // US or grid - offset < duration_b // US
+    horizon = (min(bounds) if bounds else later + MONTHLY_CYCLE) + max(duration_a, duration_b)
+    if rule_a.spacing < rule_b.spacing:  # walk the sparser series
+        a, rule_a, b, rule_b = b, rule_b, a, rule_a
+    for occurrence in rule_a.occurrences(a, later, horizon):
+        if next(rule_b.occurrences(b, occurrence.start, occurrence.end), None) is not None:
+            return True
+    return False
 
 # -------------------- Recurrence Factory --------------------
 class RecurrenceFactory:
+    _strategies = {}  # rules are stateless: one shared instance per recurrence
+
     def get_strategy(self, recurrence: str):
+        strategy = self._strategies.get(recurrence)
+        if strategy is not None:
+            return strategy
         if recurrence == "DAILY":
-            return DailyRecurrence()
+            strategy = DailyRecurrence()
         elif recurrence == "WEEKLY":
-            return WeeklyRecurrence()
+            strategy = WeeklyRecurrence()
         elif recurrence == "MONTHLY":
-            return MonthlyRecurrence()
+            strategy = MonthlyRecurrence()
         else:
             return None
+        self._strategies[recurrence] = strategy
+        return strategy
 
 # -------------------- Usage --------------------
 if __name__ == "__main__":
@@ -117,26 +703,39 @@ if __name__ == "__main__":
     alice.calendar.create_event(meeting)
     meeting.add_participant(bob)
 
-    alice.calendar.list_events("DAILY")
+    print(render_agenda(f"DAILY agenda for {alice.name}", alice.calendar.list_events("DAILY")))
+
+    # The series is stored as a rule; its occurrences are expanded only for the agenda window
+    print(render_agenda(f"WEEKLY agenda for {alice.name}", alice.calendar.list_events("WEEKLY")))
+
+    # Series vs series is decided from the rules: a weekly at the same hour collides with the daily
+    review = Event("Weekly Review", now + timedelta(days=3, hours=2, minutes=30), now + timedelta(days=3, hours=4),
+                   alice, recurrence="WEEKLY")
+    print("Conflicts:", [event.title for event in alice.calendar.find_conflicts(review)])
 
-    # Add recurring next instance
-    strategy = RecurrenceFactory().get_strategy(meeting.recurrence)
-    if strategy:
-        next_event = strategy.get_next_occurrence(meeting)
-        alice.calendar.create_event(next_event)
-        alice.calendar.list_events("WEEKLY")
-    
     meeting = Event("Conflict Sync", now + timedelta(hours=2), now + timedelta(hours=3), alice, recurrence="DAILY")
 
     alice.calendar.create_event(meeting)
     meeting.add_participant(bob)
 
-    alice.calendar.list_events("DAILY")
+    print(render_agenda(f"DAILY agenda for {alice.name}", alice.calendar.list_events("DAILY")))
 
-    meeting = Event("Monthly Sync", now + timedelta(hours=4), now + timedelta(hours=5), alice, recurrence="DAILY")
+    meeting = Event("Monthly Sync", now + timedelta(hours=4), now + timedelta(hours=5), alice, recurrence="MONTHLY")
 
     alice.calendar.create_event(meeting)
     meeting.add_participant(bob)
 
-    alice.calendar.list_events("MONTHLY")
+    print(render_agenda(f"WEEKLY agenda for {alice.name}", alice.calendar.list_events("WEEKLY")))
+    # Accepted invites are fanned out: Bob's calendar has Alice's series too
+    print(render_agenda(f"DAILY agenda for {bob.name}", bob.calendar.list_events("DAILY")))
+
+    # Editing evicts only the cached agenda windows the change lands in
+    alice.calendar.update_event(meeting, start=now + timedelta(days=1, hours=5), end=now + timedelta(days=1, hours=6))
+    print(render_agenda(f"WEEKLY agenda for {alice.name}", alice.calendar.list_events("WEEKLY")))
 
+    # Common free slots across participants (k-way sweep over everyone's busy intervals)
+    carol = User("U3", "Carol")
+    carol.calendar.create_event(Event("Focus Time", now + timedelta(hours=1), now + timedelta(hours=6), carol))
+    slots = find_common_slots([alice, bob, carol], timedelta(hours=1), (now, now + timedelta(days=2)), limit=3,
+                              working_hours=(9, 18))
+    print("Common 1h slots:", [f"{start:%m-%d %H:%M}-{end:%H:%M}" for start, end in slots])
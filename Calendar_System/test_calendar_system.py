@@ -0,0 +1,38 @@
+import unittest
+from datetime import datetime, timedelta
+
+from calendar_system import Event, User, find_common_slots, free_busy, off_hours
+
+
+class FreeBusyTest(unittest.TestCase):
+    # Starts and ends partway through a working day
+    window = (datetime(2025, 1, 6, 14), datetime(2025, 1, 7, 10))
+    working_hours = (9, 18)
+
+    def test_off_hours_are_clipped_to_the_window(self):
+        self.assertEqual(list(off_hours(*self.window, self.working_hours)), [
+            (datetime(2025, 1, 6, 18), datetime(2025, 1, 7)),
+            (datetime(2025, 1, 7), datetime(2025, 1, 7, 9)),
+        ])
+
+    def test_partial_day_window(self):
+        alice, bob = User("u1", "Alice"), User("u2", "Bob")
+        alice.calendar.create_event(Event("Review", datetime(2025, 1, 6, 15), datetime(2025, 1, 6, 16), alice))
+        bob.calendar.create_event(Event("Standup", datetime(2025, 1, 7, 9), datetime(2025, 1, 7, 9, 30), bob))
+
+        busy = list(free_busy([alice, bob], *self.window, self.working_hours))
+        self.assertEqual(busy, [
+            (datetime(2025, 1, 6, 15), datetime(2025, 1, 6, 16)),
+            (datetime(2025, 1, 6, 18), datetime(2025, 1, 7, 9, 30)),
+        ])
+        self.assertTrue(all(start < end for start, end in busy))
+
+        slots = find_common_slots([alice, bob], timedelta(hours=1), self.window, working_hours=self.working_hours)
+        self.assertEqual(slots, [
+            (datetime(2025, 1, 6, 14), datetime(2025, 1, 6, 15)),
+            (datetime(2025, 1, 6, 16), datetime(2025, 1, 6, 17)),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from calendar_system import User
+from ical import import_calendar, parse_rrule, read_vevents
+
+
+def vevent(*properties):
+    return ["BEGIN:VEVENT", *properties, "END:VEVENT"]
+
+
+class ReadVeventsTest(unittest.TestCase):
+    def test_nested_alarm_does_not_leak_into_the_event(self):
+        lines = vevent("UID:1", "DTSTART:20250101T090000", "BEGIN:VALARM", "ACTION:DISPLAY",
+                       "DURATION:PT5H", "TRIGGER:-PT15M", "END:VALARM", "SUMMARY:Standup")
+        (event,) = read_vevents(lines)
+        self.assertNotIn("DURATION", event)
+        self.assertNotIn("TRIGGER", event)
+        self.assertEqual(event["SUMMARY"][1], "Standup")
+
+    def test_mismatched_nested_end_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(read_vevents(vevent("BEGIN:VALARM", "END:VTODO")))
+
+
+class ParseRruleTest(unittest.TestCase):
+    monday = datetime(2025, 1, 6, 9)
+
+    def test_weekly_byday_on_the_start_weekday(self):
+        self.assertEqual(parse_rrule("FREQ=WEEKLY;BYDAY=MO", self.monday), ("WEEKLY", None))
+        _, until = parse_rrule("FREQ=WEEKLY;BYDAY=MO;COUNT=2", self.monday)
+        self.assertEqual(until, self.monday + timedelta(weeks=2))
+
+    def test_other_byday_rules_are_rejected(self):
+        for rule in ("FREQ=WEEKLY;BYDAY=TU", "FREQ=WEEKLY;BYDAY=MO,WE", "FREQ=DAILY;BYDAY=MO"):
+            with self.assertRaises(ValueError, msg=rule):
+                parse_rrule(rule, self.monday)
+
+
+class ImportCalendarTest(unittest.TestCase):
+    def import_lines(self, lines, user=None):
+        handle, path = tempfile.mkstemp(suffix=".ics")
+        with os.fdopen(handle, "w", newline="") as f:
+            f.write("\r\n".join(["BEGIN:VCALENDAR", *lines, "END:VCALENDAR"]) + "\r\n")
+        user = user or User("U1", "Importer")
+        try:
+            return user, import_calendar(user.calendar, path)
+        finally:
+            os.remove(path)
+
+    def test_series_exceptions_are_rejected(self):
+        for name in ("EXDATE:20250113T090000", "RDATE:20250114T090000", "RECURRENCE-ID:20250113T090000"):
+            with self.assertRaises(ValueError, msg=name):
+                self.import_lines(vevent("UID:1", "DTSTART:20250106T090000", "DTEND:20250106T100000",
+                                         "RRULE:FREQ=WEEKLY", name))
+
+    def test_failed_import_leaves_the_calendar_unchanged(self):
+        user = User("U1", "Importer")
+        series = vevent("UID:s", "DTSTART:20250106T090000", "DTEND:20250106T100000", "RRULE:FREQ=DAILY")
+        one_off = vevent("UID:o", "DTSTART:20250107T120000", "DTEND:20250107T130000")
+        broken = vevent("UID:b", "DTSTART:20250108T090000", "RRULE:FREQ=YEARLY")
+        with self.assertRaises(ValueError):
+            self.import_lines(series + one_off + broken, user)
+        self.assertEqual(len(user.calendar.series), 0)
+        self.assertEqual(len(list(user.calendar.index)), 0)
+
+    def test_alarm_duration_keeps_the_event_length(self):
+        user, count = self.import_lines(vevent("UID:1", "DTSTART:20250106T090000", "DURATION:PT1H", "BEGIN:VALARM",
+                                               "DURATION:PT5H", "END:VALARM", "RRULE:FREQ=WEEKLY;BYDAY=MO"))
+        self.assertEqual(count, 1)
+        (event,) = user.calendar.series
+        self.assertEqual(event.end - event.start, timedelta(hours=1))
+        self.assertEqual(event.recurrence, "WEEKLY")
+
+
+if __name__ == "__main__":
+    unittest.main()
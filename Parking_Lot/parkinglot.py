@@ -224,6 +224,7 @@ A modular and scalable parking lot system designed using Object-Oriented Design
 '''
 from abc import ABC, abstractmethod
 from collections import defaultdict
+import bisect
 import uuid
 from datetime import datetime
 
@@ -331,6 +332,8 @@ class ParkingStrategy(ABC):
     def find_parking_spot(self, spot_type):
         pass
 
+# Free lists are kept in spot rank order (the order spots were added, i.e. distance from
+# the entrance), so both strategies below pick by rank.
 class NearestFirstStrategy(ParkingStrategy):
     def __init__(self, parking_lot):
         self.parking_lot = parking_lot
@@ -341,6 +344,16 @@ class NearestFirstStrategy(ParkingStrategy):
                 return spot
         return None
 
+class FarthestFirstStrategy(ParkingStrategy):
+    def __init__(self, parking_lot):
+        self.parking_lot = parking_lot
+
+    def find_parking_spot(self, spot_type):
+        for spot in reversed(self.parking_lot.free_parking_spots[spot_type]):
+            if spot.is_free:
+                return spot
+        return None
+
 
 # ----------- SERVICES --------------
 class ParkingSpotService:
@@ -355,9 +368,9 @@ class ParkingSpotService:
 
 
 class ParkingService:
-    def __init__(self, parking_lot):
+    def __init__(self, parking_lot, strategy=None):
         self.parking_lot = parking_lot
-        self.strategy = NearestFirstStrategy(parking_lot)
+        self.strategy = strategy or NearestFirstStrategy(parking_lot)
 
     def entry(self, vehicle):
         spot_type = vehicle.get_supported_spot()
@@ -376,7 +389,7 @@ class ParkingService:
             spot_type = ticket.vehicle.get_supported_spot()
             ticket.parking_spot.is_free = True
             self.parking_lot.occupied_parking_spots[spot_type].remove(ticket.parking_spot)
-            self.parking_lot.free_parking_spots[spot_type].append(ticket.parking_spot)
+            self.parking_lot.release_spot(spot_type, ticket.parking_spot)
             self.parking_lot.display_board.change(spot_type, 1)
             print("Payment successful. Thank you!")
 
@@ -388,13 +401,19 @@ class ParkingLot:
         self.entrances = []
         self.exits = []
         self.display_board = DisplayBoard()
-        self.free_parking_spots = defaultdict(list)
+        self.free_parking_spots = defaultdict(list)  # sorted by spot rank
         self.occupied_parking_spots = defaultdict(list)
+        self.spot_rank = {}  # spot -> order of addition (distance from the entrance)
 
     def add_parking_spot(self, spot_enum, spot):
+        self.spot_rank[spot] = len(self.spot_rank)
         self.free_parking_spots[spot_enum].append(spot)
         self.display_board.change(spot_enum, 1)
 
+    def release_spot(self, spot_enum, spot):
+        # Back into its rank position, not the end: the free list must stay in distance order
+        bisect.insort(self.free_parking_spots[spot_enum], spot, key=self.spot_rank.__getitem__)
+
 def main():
     # Setup
     lot = ParkingLot("MyLot")
@@ -0,0 +1,34 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from parkinglot import (Car, Cash, FarthestFirstStrategy, NearestFirstStrategy, ParkingLot, ParkingService,
+                        ParkingSpotEnum, ParkingSpotService)
+
+
+def build_lot(n_spots=5):
+    lot = ParkingLot("TestLot")
+    for i in range(n_spots):
+        lot.add_parking_spot(ParkingSpotEnum.COMPACT, ParkingSpotService.create(ParkingSpotEnum.COMPACT, f"C{i}", 1, 20))
+    return lot
+
+
+class StrategyTest(unittest.TestCase):
+    def park_after_churn(self, strategy_class):
+        lot = build_lot()
+        service = ParkingService(lot, strategy_class(lot))
+        with redirect_stdout(io.StringIO()):
+            tickets = {ticket.parking_spot.id: ticket for ticket in (service.entry(Car(f"Car{i}")) for i in range(5))}
+            for spot_id in ("C4", "C2", "C0"):  # freed in an order unrelated to distance
+                service.exit(tickets[spot_id], Cash())
+        return service.entry(Car("Next")).parking_spot.id
+
+    def test_nearest_first_picks_the_lowest_rank_after_exits(self):
+        self.assertEqual(self.park_after_churn(NearestFirstStrategy), "C0")
+
+    def test_farthest_first_picks_the_highest_rank_after_exits(self):
+        self.assertEqual(self.park_after_churn(FarthestFirstStrategy), "C4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+# 📊 Pizza Builder benchmarks
+#
+# Usage:
+#   python benchmark.py              # run all benchmarks
+#   python benchmark.py order_line   # run one benchmark by name
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bulk_pricing import BulkPricer, random_orders
+from kitchen import KitchenConfig, KitchenPipeline, dinner_rush, simulate
+from pizza_builder import (REGISTRY, ChicagoFactory, Cheese, Jalapenos, NewYorkFactory, NYFarmhouse, NYMargherita,
+                           Olives, PizzaDecorator, PizzaRegistry, PriceTable, Size, compile_order)
+
+TOPPINGS = (Cheese, Jalapenos, Olives)
+SIZES = ("small", "medium", "large")
+
+# ------------------ HELPERS ------------------
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6  # microseconds per call
+
+def random_pizza(rng, max_toppings=10):
+    factory = rng.choice((NewYorkFactory(), ChicagoFactory()))
+    pizza = factory.get_pizza(rng.choice(("Margherita", "Farmhouse")))
+    layers = [rng.choice(TOPPINGS) for _ in range(rng.randint(0, max_toppings))]
+    layers.insert(rng.randint(0, len(layers)), None)  # the Size layer, anywhere in the chain
+    for layer in layers:
+        pizza = Size(pizza, rng.choice(SIZES).title()) if layer is None else layer(pizza)
+    return pizza
+
+def recursive_cost(pizza):
+    # The original decorator behaviour: every call walks the chain
+    if isinstance(pizza, PizzaDecorator):
+        return recursive_cost(pizza._pizza) + pizza.layer_cost()
+    return pizza.get_cost()
+
+def recursive_description(pizza):
+    if isinstance(pizza, PizzaDecorator):
+        return recursive_description(pizza._pizza) + pizza.layer_description()
+    return pizza.get_description()
+
+# ------------------ BENCHMARKS ------------------
+def bench_order_line(depth=200, renders=20_000, trials=2_000, seed=1):
+    """Re-rendering a heavily customized order: recursive decorator walk vs cached flat order line."""
+    print(f"== Order line: {depth} toppings, {renders:,} re-renders ==")
+    rng = random.Random(seed)
+    for _ in range(trials):
+        pizza = random_pizza(rng)
+        assert pizza.get_cost() == recursive_cost(pizza)
+        assert pizza.get_description() == recursive_description(pizza)
+
+    pizza = Size(NewYorkFactory().get_pizza("Farmhouse"), "Large")
+    for i in range(depth):
+        pizza = TOPPINGS[i % 3](pizza)
+
+    def recursive():
+        recursive_cost(pizza), recursive_description(pizza)
+
+    def cached():
+        pizza.get_cost(), pizza.get_description()
+
+    def compile_fresh():
+        compile_order(pizza)
+
+    print(f"recursive walk     {timed(recursive, renders // 10):>10,.2f} us/render")
+    print(f"compile (uncached) {timed(compile_fresh, renders // 10):>10,.2f} us/render")
+    print(f"cached order line  {timed(cached, renders):>10,.2f} us/render")
+
+    deep = NewYorkFactory().get_pizza("Margherita")
+    for i in range(100_000):
+        deep = TOPPINGS[i % 3](deep)
+    try:
+        recursive_cost(deep)
+        print("recursive walk at 100k toppings: ok")
+    except RecursionError:
+        print("recursive walk at 100k toppings: RecursionError")
+    started = time.perf_counter()
+    assert deep.order_line().cost == 200 + 100_000 // 3 * 120 + 50
+    print(f"order line at 100k toppings: {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+def bench_factory(orders=200_000, seed=3):
+    """get_pizza: if/elif chain building a new instance per order vs registry lookup of a shared prototype."""
+    print(f"== Factory lookups: {orders:,} orders ==")
+    rng = random.Random(seed)
+    names = [rng.choice(("Margherita", "farmhouse", "FARMHOUSE", "margherita ")) for _ in range(orders)]
+
+    def legacy_get_pizza(pizza_type):
+        if pizza_type.lower() == "margherita":
+            return NYMargherita()
+        elif pizza_type.lower() == "farmhouse":
+            return NYFarmhouse()
+        return None
+
+    factory = NewYorkFactory()
+    for name in names[:1000]:
+        pizza = factory.get_pizza(name)
+        assert pizza.get_description() == "New York " + name.strip().title()
+
+    def legacy():
+        for name in names:
+            legacy_get_pizza(name)
+
+    def registry():
+        get_pizza = factory.get_pizza
+        for name in names:
+            get_pizza(name)
+
+    print(f"if/elif + new instance  {timed(legacy, 3) / orders:>8,.3f} us/order")
+    print(f"registry prototype      {timed(registry, 3) / orders:>8,.3f} us/order")
+
+    # Runtime reload: a new style and new prices without restarting; cached order lines re-price on next use
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "menu.json")
+        with open(REGISTRY.path, encoding="utf-8") as handle:
+            menu = json.load(handle)
+        registry = PizzaRegistry(PriceTable())
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(menu, handle)
+        registry.load(path)
+        menu["styles"]["California"] = {"Farmhouse": "California Farmhouse"}
+        menu["toppings"]["Cheese"] = 60
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(menu, handle)
+        os.utime(path, ns=(0, registry._mtime + 1))
+        started = time.perf_counter()
+        assert registry.reload_if_changed()
+        assert registry.prices.topping("cheese") == 60
+        assert registry.factory("california").get_pizza("farmhouse").get_description() == "California Farmhouse"
+        print(f"menu reload             {(time.perf_counter() - started) * 1e3:>8,.3f} ms")
+
+def check_schedule(report, config):
+    # Stages in order, batches within slot limits, never more busy stations/ovens than configured
+    for t in report.tickets:
+        assert t.arrived <= t.prep_start <= t.prep_end <= t.bake_start <= t.bake_end
+    assert all(size <= config.oven_slots for size in report.batches)
+    busy = 0
+    for _, delta in sorted([(t.prep_end, -1) for t in report.tickets] + [(t.prep_start, 1) for t in report.tickets]):
+        busy += delta
+        assert busy <= config.stations
+    ovens = sorted({(t.bake_start, t.bake_end) for t in report.tickets})
+    running = []
+    for start, end in ovens:
+        running = [e for e in running if e > start] + [end]
+        assert len(running) <= config.ovens
+
+def bench_kitchen(n_pizzas=100_000, threaded=300, seed=4):
+    """Deterministic kitchen simulation speed, plus a real worker-pool run of the same plan."""
+    print(f"== Kitchen pipeline: {n_pizzas:,} simulated pizzas ==")
+    config = KitchenConfig(stations=40, ovens=10, oven_slots=6, batch_wait=1.0)
+    pizzas, arrivals = dinner_rush(n_pizzas, hours=200, seed=seed)
+    started = time.perf_counter()
+    report = simulate(pizzas, config, arrivals)
+    elapsed = time.perf_counter() - started
+    check_schedule(report, config)
+    again = simulate(pizzas, config, arrivals)
+    assert [(t.prep_start, t.bake_end) for t in again.tickets] == [(t.prep_start, t.bake_end) for t in report.tickets]
+    print(f"simulate            {n_pizzas / elapsed:>10,.0f} pizzas/s  ({report.orders_per_hour():,.0f} orders/hour)")
+
+    config = KitchenConfig(stations=4, ovens=2, oven_slots=4, batch_wait=1.0)
+    pizzas, arrivals = dinner_rush(threaded, hours=6, seed=seed)
+    simulated = simulate(pizzas, config, arrivals)
+    started = time.perf_counter()
+    live = KitchenPipeline(config, time_scale=0.0005).run(pizzas, arrivals)
+    check_schedule(live, config)
+    print(f"threads ({threaded} pizzas, {time.perf_counter() - started:.1f}s wall): "
+          f"{live.orders_per_hour():.1f} orders/hour vs simulated {simulated.orders_per_hour():.1f}")
+
+def bench_pricing(n_orders=1_000_000, chains=20_000, seed=5):
+    """Re-pricing history: decorator chain + get_cost per order vs encoded integer arrays."""
+    print(f"== Bulk pricing: {n_orders:,} orders ==")
+    rng = random.Random(seed)
+    pricer = BulkPricer()
+    sample = [random_pizza(rng, max_toppings=6) for _ in range(chains)]
+    encoded = pricer.encode(sample)
+
+    def rebuild():
+        # What re-pricing meant before: rebuild each order's chain and ask it for its cost
+        for pizza in sample:
+            rebuilt = pizza.base_pizza()
+            for topping in pizza.order_line().toppings:
+                rebuilt = {"Cheese": Cheese, "Jalapenos": Jalapenos, "Olives": Olives}[topping](rebuilt)
+            Size(rebuilt, pizza.order_line().size or "small").get_cost()
+
+    assert list(pricer.price(*encoded)) == [pizza.get_cost() for pizza in sample]
+    orders = random_orders(pricer, n_orders, seed=seed)
+    per_order = timed(rebuild, 1) / chains
+    print(f"decorator chains   {per_order * n_orders / 1e6:>8.2f} s per {n_orders:,} (extrapolated)")
+    started = time.perf_counter()
+    pricer.price(*orders)
+    print(f"bulk arrays        {time.perf_counter() - started:>8.2f} s per {n_orders:,}")
+
+
+BENCHMARKS = {
+    "order_line": bench_order_line,
+    "factory": bench_factory,
+    "kitchen": bench_kitchen,
+    "pricing": bench_pricing,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,260 @@
+# 👨‍🍳 Kitchen pipeline for pizza orders: prepare stations -> batched ovens
+#
+# Usage:
+#   python kitchen.py            # simulates a dinner rush under a few capacity plans
+#
+# Each pizza is prepared at one of `stations` prep stations, then baked in an
+# oven: `ovens` ovens with `oven_slots` slots each bake a batch together. An
+# idle oven starts as soon as it can fill every slot, or once the oldest
+# waiting pizza has waited `batch_wait` minutes.
+#
+# simulate() is a deterministic discrete-event simulation (simulated minutes),
+# meant for comparing capacity plans. KitchenPipeline runs the same stages on
+# real worker threads, scaling minutes to `time_scale` seconds of sleep.
+
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+from pizza_builder import Cheese, ChicagoFactory, Jalapenos, NewYorkFactory, Olives, Pizza, PizzaDecorator, Size
+
+
+class KitchenConfig:
+    def __init__(self, stations=2, ovens=1, oven_slots=4, prep_minutes=3.0, topping_minutes=0.5,
+                 bake_minutes=8.0, batch_wait=0.0):
+        if stations < 1 or ovens < 1 or oven_slots < 1:
+            raise ValueError("a kitchen needs at least one station, one oven and one oven slot")
+        self.stations = stations
+        self.ovens = ovens
+        self.oven_slots = oven_slots
+        self.prep_minutes = prep_minutes
+        self.topping_minutes = topping_minutes
+        self.bake_minutes = bake_minutes
+        self.batch_wait = batch_wait
+
+    def prep_time(self, pizza: Pizza):
+        toppings = pizza.order_line().toppings if isinstance(pizza, PizzaDecorator) else ()
+        return self.prep_minutes + self.topping_minutes * len(toppings)
+
+    def __repr__(self):
+        return (f"KitchenConfig(stations={self.stations}, ovens={self.ovens}, oven_slots={self.oven_slots}, "
+                f"batch_wait={self.batch_wait})")
+
+
+class Ticket:
+    """One pizza's trip through the kitchen; times are minutes since the start of service."""
+    __slots__ = ("order_id", "pizza", "arrived", "prep_start", "prep_end", "bake_start", "bake_end")
+
+    def __init__(self, order_id, pizza: Pizza, arrived: float):
+        self.order_id = order_id
+        self.pizza = pizza
+        self.arrived = arrived
+        self.prep_start = self.prep_end = self.bake_start = self.bake_end = None
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class KitchenReport:
+    def __init__(self, tickets, batches):
+        self.tickets = tickets
+        self.batches = batches  # number of pizzas in each oven batch, in start order
+
+    def stats(self):
+        done = self.tickets
+        stages = {
+            "prep wait": [t.prep_start - t.arrived for t in done],
+            "prep": [t.prep_end - t.prep_start for t in done],
+            "oven wait": [t.bake_start - t.prep_end for t in done],
+            "bake": [t.bake_end - t.bake_start for t in done],
+            "total": [t.bake_end - t.arrived for t in done],
+        }
+        return {stage: (sum(values) / len(values) if values else 0.0, percentile(values, 0.95))
+                for stage, values in stages.items()}
+
+    def makespan(self):
+        if not self.tickets:
+            return 0.0
+        return max(t.bake_end for t in self.tickets) - min(t.arrived for t in self.tickets)
+
+    def orders_per_hour(self):
+        span = self.makespan()
+        return len(self.tickets) * 60 / span if span else 0.0
+
+    def mean_batch(self):
+        return sum(self.batches) / len(self.batches) if self.batches else 0.0
+
+    def summary(self):
+        lines = [f"{len(self.tickets)} pizzas, {self.orders_per_hour():.1f} orders/hour, "
+                 f"{len(self.batches)} oven batches (mean {self.mean_batch():.1f} pizzas)"]
+        for stage, (mean, p95) in self.stats().items():
+            lines.append(f"  {stage:<10} mean {mean:6.1f} min   p95 {p95:6.1f} min")
+        return "\n".join(lines)
+
+
+def make_tickets(pizzas, arrivals=None):
+    arrivals = arrivals if arrivals is not None else itertools.repeat(0.0)
+    return [Ticket(order_id, pizza, arrived) for order_id, (pizza, arrived) in enumerate(zip(pizzas, arrivals))]
+
+
+# -------------------- Deterministic simulation --------------------
+ARRIVE, PREPPED, BAKED, BATCH_DUE = range(4)  # event kinds; ties at equal times break by sequence number
+
+def simulate(pizzas, config: KitchenConfig, arrivals=None) -> KitchenReport:
+    """Discrete-event run of the pipeline; arrivals are minutes (default: everything at 0)."""
+    tickets = make_tickets(pizzas, arrivals)
+    events, seq = [], itertools.count()
+    for ticket in tickets:
+        heapq.heappush(events, (ticket.arrived, next(seq), ARRIVE, ticket))
+    prep_queue, oven_queue = deque(), deque()  # oven_queue holds prepped tickets in prep_end order
+    free_stations, free_ovens = config.stations, config.ovens
+    batches, batch_due = [], None
+
+    def start_batches(now):
+        nonlocal free_ovens, batch_due
+        while free_ovens and oven_queue:
+            due = oven_queue[0].prep_end + config.batch_wait
+            if len(oven_queue) < config.oven_slots and now < due:
+                if batch_due != due:  # one wake-up per oldest pizza
+                    batch_due = due
+                    heapq.heappush(events, (due, next(seq), BATCH_DUE, None))
+                return
+            batch = [oven_queue.popleft() for _ in range(min(config.oven_slots, len(oven_queue)))]
+            for ticket in batch:
+                ticket.bake_start = now
+            free_ovens -= 1
+            batches.append(len(batch))
+            heapq.heappush(events, (now + config.bake_minutes, next(seq), BAKED, batch))
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == ARRIVE:
+            prep_queue.append(payload)
+        elif kind == PREPPED:
+            free_stations += 1
+            payload.prep_end = now
+            oven_queue.append(payload)
+        elif kind == BAKED:
+            free_ovens += 1
+            for ticket in payload:
+                ticket.bake_end = now
+        while free_stations and prep_queue:
+            ticket = prep_queue.popleft()
+            ticket.prep_start = now
+            free_stations -= 1
+            heapq.heappush(events, (now + config.prep_time(ticket.pizza), next(seq), PREPPED, ticket))
+        start_batches(now)
+    return KitchenReport(tickets, batches)
+
+
+def compare_plans(pizzas, plans: dict, arrivals=None):
+    """{plan name: KitchenConfig} -> {plan name: KitchenReport} for the same orders."""
+    arrivals = list(arrivals) if arrivals is not None else None
+    return {name: simulate(pizzas, config, arrivals) for name, config in plans.items()}
+
+
+# -------------------- Threaded pipeline --------------------
+class KitchenPipeline:
+    """Runs prepare and bake on real worker pools; a simulated minute lasts `time_scale` seconds."""
+    def __init__(self, config: KitchenConfig, time_scale=0.001):
+        self.config = config
+        self.time_scale = time_scale
+
+    def run(self, pizzas, arrivals=None) -> KitchenReport:
+        config, scale = self.config, self.time_scale
+        tickets = make_tickets(pizzas, arrivals)
+        prep_queue, oven_queue = queue.Queue(), queue.Queue()
+        batches, batches_lock = [], threading.Lock()
+        started = time.perf_counter()
+
+        def clock():
+            return (time.perf_counter() - started) / scale
+
+        def sleep_until(minute):
+            delay = minute * scale - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+        def station():
+            while (ticket := prep_queue.get()) is not None:
+                ticket.prep_start = clock()
+                time.sleep(config.prep_time(ticket.pizza) * scale)
+                ticket.prep_end = clock()
+                oven_queue.put(ticket)
+
+        def oven():
+            while (first := oven_queue.get()) is not None:
+                batch, closing = [first], False
+                deadline = time.perf_counter() + config.batch_wait * scale
+                while len(batch) < config.oven_slots:
+                    try:
+                        ticket = oven_queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                    except queue.Empty:
+                        break
+                    if ticket is None:
+                        closing = True
+                        break
+                    batch.append(ticket)
+                now = clock()
+                for ticket in batch:
+                    ticket.bake_start = now
+                with batches_lock:
+                    batches.append(len(batch))
+                time.sleep(config.bake_minutes * scale)
+                now = clock()
+                for ticket in batch:
+                    ticket.bake_end = now
+                if closing:
+                    return
+
+        stations = [threading.Thread(target=station) for _ in range(config.stations)]
+        ovens = [threading.Thread(target=oven) for _ in range(config.ovens)]
+        for worker in stations + ovens:
+            worker.start()
+        for ticket in sorted(tickets, key=lambda t: t.arrived):
+            sleep_until(ticket.arrived)
+            prep_queue.put(ticket)
+        for _ in stations:
+            prep_queue.put(None)
+        for worker in stations:
+            worker.join()
+        for _ in ovens:
+            oven_queue.put(None)
+        for worker in ovens:
+            worker.join()
+        return KitchenReport(tickets, batches)
+
+
+def dinner_rush(n_pizzas=150, hours=3.0, seed=1):
+    """Random decorated pizzas with Poisson arrivals over `hours`."""
+    rng = random.Random(seed)
+    factories = (NewYorkFactory(), ChicagoFactory())
+    pizzas, arrivals, now = [], [], 0.0
+    for _ in range(n_pizzas):
+        pizza = Size(rng.choice(factories).get_pizza(rng.choice(("Margherita", "Farmhouse"))),
+                     rng.choice(("Small", "Medium", "Large")))
+        for _ in range(rng.randint(0, 4)):
+            pizza = rng.choice((Cheese, Jalapenos, Olives))(pizza)
+        now += rng.expovariate(n_pizzas / (hours * 60))
+        pizzas.append(pizza)
+        arrivals.append(now)
+    return pizzas, arrivals
+
+
+if __name__ == "__main__":
+    pizzas, arrivals = dinner_rush()
+    plans = {
+        "2 stations, 1 oven x4": KitchenConfig(stations=2, ovens=1, oven_slots=4),
+        "4 stations, 1 oven x4": KitchenConfig(stations=4, ovens=1, oven_slots=4),
+        "4 stations, 1 oven x4, 2 min batching": KitchenConfig(stations=4, ovens=1, oven_slots=4, batch_wait=2.0),
+        "4 stations, 2 ovens x4": KitchenConfig(stations=4, ovens=2, oven_slots=4),
+    }
+    for name, report in compare_plans(pizzas, plans, arrivals).items():
+        print(f"== {name} ==")
+        print(report.summary())
@@ -1,5 +1,11 @@
 # ======= Interfaces and Base Classes =======
+import json
+import os
+import threading
 from abc import ABC, abstractmethod
+from functools import lru_cache
+
+MENU_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "menu.json")
 
 # Base Pizza Interface
 class Pizza(ABC):
@@ -21,6 +27,8 @@ class Pizza(ABC):
 
 # ======= Concrete Base Pizzas =======
 class Margherita(Pizza):
+    kind = "Margherita"
+
     def prepare(self):
         print("Preparing Margherita pizza")
 
@@ -31,9 +39,11 @@ class Margherita(Pizza):
         return "Margherita"
 
     def get_cost(self):
-        return 200
+        return PRICES.base(self.kind)
 
 class Farmhouse(Pizza):
+    kind = "Farmhouse"
+
     def prepare(self):
         print("Preparing Farmhouse pizza")
 
@@ -44,7 +54,7 @@ class Farmhouse(Pizza):
         return "Farmhouse"
 
     def get_cost(self):
-        return 250
+        return PRICES.base(self.kind)
 
 # ======= NY and Chicago Variants =======
 class NYMargherita(Margherita):
@@ -63,74 +73,315 @@ class ChicagoFarmhouse(Farmhouse):
     def get_description(self):
         return "Chicago Farmhouse"
 
+# ======= Menu: Price Table and Registry =======
+@lru_cache(maxsize=4096)  # menus and callers use a handful of spellings
+def normalize(name: str) -> str:
+    """'  New-York ' -> 'new york': the key every menu lookup uses."""
+    return " ".join(name.casefold().replace("-", " ").replace("_", " ").split())
+
+class PriceSnapshot:
+    """Immutable prices of one menu load: bases, toppings and sizes by normalized name, plus its version."""
+    __slots__ = ("bases", "toppings", "sizes", "version")
+
+    def __init__(self, bases: dict, toppings: dict, sizes: dict, version: int):
+        for name, value in zip(self.__slots__, (bases, toppings, sizes, version)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PriceSnapshot is immutable")
+
+class PriceTable:
+    """Base, topping and size prices by normalized name. `version` changes on every reload
+    so cached order lines know to re-price."""
+    def __init__(self):
+        self.current = PriceSnapshot({}, {}, {}, 0)
+
+    def update(self, bases: dict, toppings: dict, sizes: dict):
+        # One reference swap: a reader that takes `current` once sees either the old table or the new one
+        self.current = PriceSnapshot({normalize(name): price for name, price in bases.items()},
+                                     {normalize(name): price for name, price in toppings.items()},
+                                     {normalize(name): price for name, price in sizes.items()},
+                                     self.current.version + 1)
+
+    @property
+    def bases(self) -> dict:
+        return self.current.bases
+
+    @property
+    def toppings(self) -> dict:
+        return self.current.toppings
+
+    @property
+    def sizes(self) -> dict:
+        return self.current.sizes
+
+    @property
+    def version(self) -> int:
+        return self.current.version
+
+    def base(self, kind: str) -> int:
+        return self.current.bases[normalize(kind)]
+
+    def topping(self, name: str) -> int:
+        return self.current.toppings[normalize(name)]
+
+    def size(self, name: str) -> int:
+        return self.current.sizes.get(normalize(name), 0)  # unknown sizes are priced as small
+
+class MenuPizza(Pizza):
+    """A style's pizza as described by the menu; one shared prototype per (style, type)."""
+    def __init__(self, kind: str, description: str, prices: PriceTable):
+        self.kind = kind
+        self.description = description
+        self.prices = prices
+
+    def prepare(self):
+        print(f"Preparing {self.kind} pizza")
+
+    def bake(self):
+        print(f"Baking {self.kind} pizza")
+
+    def get_description(self):
+        return self.description
+
+    def get_cost(self):
+        return self.prices.base(self.kind)
+
+class PizzaRegistry:
+    """Styles and pizza types loaded from a menu file (see menu.json):
+
+        {"pizzas": {type: price}, "toppings": {name: price}, "sizes": {name: price},
+         "styles": {style: {type: description}}}
+    """
+    def __init__(self, prices: PriceTable):
+        self.prices = prices
+        self.styles = {}  # normalized style -> {normalized type -> prototype}
+        self.version = 0  # bumped on every change, so factories drop their alias caches
+        self.path = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def load(self, path=MENU_FILE):
+        with open(path, encoding="utf-8") as handle:
+            menu = json.load(handle)
+        with self._lock:
+            self.load_menu(menu)
+            self.path, self._mtime = path, os.stat(path).st_mtime_ns
+
+    def load_menu(self, menu: dict):
+        pizzas = menu.get("pizzas", {})
+        priced = {normalize(name) for name in pizzas}
+        styles = {}
+        for style, types in menu.get("styles", {}).items():
+            prototypes = {}
+            for kind, description in types.items():
+                if normalize(kind) not in priced:
+                    raise ValueError(f"style {style!r} lists {kind!r}, which has no price")
+                prototypes[normalize(kind)] = MenuPizza(kind, description, self.prices)
+            styles[normalize(style)] = prototypes
+        self.prices.update(pizzas, menu.get("toppings", {}), menu.get("sizes", {}))
+        self.styles = styles
+        self.version += 1
+
+    def reload_if_changed(self):
+        """Re-reads the menu file if it changed on disk; returns True if it did."""
+        if self.path is None or os.stat(self.path).st_mtime_ns == self._mtime:
+            return False
+        self.load(self.path)
+        return True
+
+    def register(self, style: str, pizza_type: str, prototype: Pizza):
+        with self._lock:
+            self.styles.setdefault(normalize(style), {})[normalize(pizza_type)] = prototype
+            self.version += 1
+
+    def get(self, style: str, pizza_type: str):
+        return self.styles.get(normalize(style), {}).get(normalize(pizza_type))
+
+    def factory(self, style: str) -> "RegistryPizzaFactory":
+        if normalize(style) not in self.styles:
+            raise KeyError(f"unknown style {style!r}")
+        return RegistryPizzaFactory(style, self)
+
 # ======= Abstract Factory Pattern =======
 class AbstractPizzaFactory(ABC):
     @abstractmethod
     def get_pizza(self, pizza_type: str) -> Pizza:
         pass
 
-class NewYorkFactory(AbstractPizzaFactory):
-    def get_pizza(self, pizza_type: str):
-        if pizza_type.lower() == "margherita":
-            return NYMargherita()
-        elif pizza_type.lower() == "farmhouse":
-            return NYFarmhouse()
-        return None
+class RegistryPizzaFactory(AbstractPizzaFactory):
+    """Returns the registry's shared prototype; pizzas are never mutated (decorators wrap them).
+    Spellings already seen resolve with a single dict lookup."""
+    style = None
+    MAX_ALIASES = 1024
+
+    def __init__(self, style: str = None, registry: PizzaRegistry = None):
+        self.style = style or self.style
+        self.registry = registry or REGISTRY
+        self._aliases = {}  # pizza_type as given -> prototype
+        self._version = self.registry.version
 
-class ChicagoFactory(AbstractPizzaFactory):
     def get_pizza(self, pizza_type: str):
-        if pizza_type.lower() == "margherita":
-            return ChicagoMargherita()
-        elif pizza_type.lower() == "farmhouse":
-            return ChicagoFarmhouse()
-        return None
+        if self._version != self.registry.version or len(self._aliases) >= self.MAX_ALIASES:
+            self._aliases, self._version = {}, self.registry.version
+        pizza = self._aliases.get(pizza_type)
+        if pizza is None:
+            pizza = self.registry.get(self.style, pizza_type)
+            if pizza is not None:
+                self._aliases[pizza_type] = pizza
+        return pizza
+
+class NewYorkFactory(RegistryPizzaFactory):
+    style = "New York"
+
+class ChicagoFactory(RegistryPizzaFactory):
+    style = "Chicago"
+
+# ======= Flattened Order Line =======
+class OrderLine:
+    """Immutable, flat view of a decorated pizza: base, size, toppings in order, cost and description."""
+    __slots__ = ("base", "base_cost", "size", "toppings", "cost", "description", "version")
+
+    def __init__(self, base: str, base_cost: int, size, toppings: tuple, cost: int, description: str, version=0):
+        for name, value in zip(self.__slots__, (base, base_cost, size, tuple(toppings), cost, description, version)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OrderLine is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, OrderLine) and all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, n) for n in self.__slots__))
+
+    def __repr__(self):
+        return f"OrderLine({self.description!r}, cost={self.cost})"
+
+def _overrides(layer, method: str) -> bool:
+    # Decorators written against the recursive API compute get_cost/get_description/prepare/bake themselves
+    cls = layer if isinstance(layer, type) else type(layer)
+    return getattr(cls, method) is not getattr(PizzaDecorator, method)
+
+def _base_line(pizza: Pizza, version) -> OrderLine:
+    description, cost = pizza.get_description(), pizza.get_cost()
+    return OrderLine(description, cost, None, (), cost, description, version)
+
+def _custom_layer_line(layer, version) -> OrderLine:
+    """Line for a decorator that overrides get_cost and/or get_description: its own methods
+    are the truth, everything below it is flattened as usual."""
+    inner = layer._pizza
+    line = inner.order_line() if isinstance(inner, PizzaDecorator) else _base_line(inner, version)
+    cost = layer.get_cost() if _overrides(layer, "get_cost") else line.cost + layer.layer_cost()
+    description = (layer.get_description() if _overrides(layer, "get_description")
+                   else line.description + layer.layer_description())
+    toppings = line.toppings + (layer.name,) if isinstance(layer, ToppingDecorator) else line.toppings
+    return OrderLine(line.base, line.base_cost, line.size, toppings, cost, description, version)
+
+def compile_order(pizza: Pizza) -> OrderLine:
+    """Flattens a decorator chain without recursion; stops at the first layer whose line is
+    already cached and priced with the current version of the chain's price table."""
+    version = (getattr(pizza, "prices", None) or PRICES).version
+    layers, node = [], pizza
+    while isinstance(node, PizzaDecorator) and (node._line is None or node._line.version != version):
+        if node.custom_line:
+            node._line = _custom_layer_line(node, version)
+            break
+        layers.append(node)
+        node = node._pizza
+    line = node._line if isinstance(node, PizzaDecorator) else _base_line(node, version)
+    if not layers:
+        return line
+
+    size, toppings, cost, parts = line.size, list(line.toppings), line.cost, [line.description]
+    for layer in reversed(layers):  # innermost first, the order the decorators were applied
+        cost += layer.layer_cost()
+        parts.append(layer.layer_description())
+        if isinstance(layer, ToppingDecorator):
+            toppings.append(layer.name)
+        elif isinstance(layer, Size):
+            size = layer._size
+    return OrderLine(line.base, line.base_cost, size, toppings, cost, "".join(parts), version)
 
 # ======= Decorators for Toppings, Size =======
 class PizzaDecorator(Pizza):
+    """Wraps a pizza. Cost and description come from the flattened, cached order line,
+    so deep chains cost O(1) per call after the first and never recurse. A menu reload
+    re-prices the line on next use.
+
+    Subclasses describe their own layer with layer_cost()/layer_description(). Older
+    decorators that override get_cost/get_description/prepare/bake instead still work:
+    their methods are called for their layer and the layers below them."""
+    custom_line = False  # set per subclass: it overrides get_cost or get_description
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.custom_line = _overrides(cls, "get_cost") or _overrides(cls, "get_description")
+
     def __init__(self, pizza: Pizza):
         self._pizza = pizza
+        self._line = None
+        # The base pizza's table (a MenuPizza's registry; PRICES for the classic pizzas) prices every layer
+        self.prices = getattr(pizza, "prices", None) or PRICES
+
+    def order_line(self) -> OrderLine:
+        if self._line is None or self._line.version != self.prices.version:
+            self._line = compile_order(self)
+        return self._line
+
+    def base_pizza(self) -> Pizza:
+        node = self._pizza
+        while isinstance(node, PizzaDecorator):
+            node = node._pizza
+        return node
+
+    def _layers_down_to(self, method: str):
+        # (layers from self inward that use the default `method`, the pizza whose own `method` runs first)
+        layers, node = [], self
+        while isinstance(node, PizzaDecorator) and (node is self or not _overrides(node, method)):
+            layers.append(node)
+            node = node._pizza
+        return layers, node
 
-class Cheese(PizzaDecorator):
     def prepare(self):
-        self._pizza.prepare()
-        print("Adding Cheese")
+        layers, node = self._layers_down_to("prepare")
+        node.prepare()
+        for layer in reversed(layers):
+            if isinstance(layer, ToppingDecorator):
+                print(f"Adding {layer.name}")
 
     def bake(self):
-        self._pizza.bake()
+        self._layers_down_to("bake")[1].bake()
 
     def get_description(self):
-        return self._pizza.get_description() + ", Cheese"
+        return self.order_line().description
 
     def get_cost(self):
-        return self._pizza.get_cost() + 50
+        return self.order_line().cost
 
-class Jalapenos(PizzaDecorator):
-    def prepare(self):
-        self._pizza.prepare()
-        print("Adding Jalapenos")
+    def layer_cost(self):
+        return 0
 
-    def bake(self):
-        self._pizza.bake()
+    def layer_description(self):
+        return ""
 
-    def get_description(self):
-        return self._pizza.get_description() + ", Jalapenos"
+class ToppingDecorator(PizzaDecorator):
+    name = None
 
-    def get_cost(self):
-        return self._pizza.get_cost() + 40
+    def layer_cost(self):
+        return self.prices.topping(self.name)
 
-class Olives(PizzaDecorator):
-    def prepare(self):
-        self._pizza.prepare()
-        print("Adding Olives")
+    def layer_description(self):
+        return f", {self.name}"
 
-    def bake(self):
-        self._pizza.bake()
+class Cheese(ToppingDecorator):
+    name = "Cheese"
 
-    def get_description(self):
-        return self._pizza.get_description() + ", Olives"
+class Jalapenos(ToppingDecorator):
+    name = "Jalapenos"
 
-    def get_cost(self):
-        return self._pizza.get_cost() + 30
+class Olives(ToppingDecorator):
+    name = "Olives"
 
 # ======= Size Decorator =======
 class Size(PizzaDecorator):
@@ -138,18 +389,16 @@ class Size(PizzaDecorator):
         super().__init__(pizza)
         self._size = size.lower()
 
-    def prepare(self):
-        self._pizza.prepare()
+    def layer_cost(self):
+        return self.prices.size(self._size)
 
-    def bake(self):
-        self._pizza.bake()
+    def layer_description(self):
+        return f" ({self._size.title()})"
 
-    def get_description(self):
-        return self._pizza.get_description() + f" ({self._size.title()})"
-
-    def get_cost(self):
-        size_cost = {"small": 0, "medium": 50, "large": 100}
-        return self._pizza.get_cost() + size_cost.get(self._size, 0)
+# ======= Default Menu =======
+PRICES = PriceTable()
+REGISTRY = PizzaRegistry(PRICES)
+REGISTRY.load()
 
 # ======= Sample Driver =======
 if __name__ == "__main__":
@@ -164,3 +413,4 @@ if __name__ == "__main__":
     print("\nOrder Summary:")
     print("Description:", pizza.get_description())
     print("Total Cost:", pizza.get_cost())
+    print("Order Line:", pizza.order_line().toppings, pizza.order_line().size)
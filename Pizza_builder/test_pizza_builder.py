@@ -0,0 +1,147 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from bulk_pricing import BulkPricer
+from pizza_builder import (PRICES, Cheese, Farmhouse, Jalapenos, Margherita, NewYorkFactory, Olives, PizzaDecorator,
+                          PizzaRegistry, PriceTable, Size)
+
+
+class Mushrooms(PizzaDecorator):
+    """Written against the original recursive decorator API."""
+    def prepare(self):
+        self._pizza.prepare()
+        print("Adding Mushrooms")
+
+    def bake(self):
+        self._pizza.bake()
+
+    def get_description(self):
+        return self._pizza.get_description() + ", Mushrooms"
+
+    def get_cost(self):
+        return self._pizza.get_cost() + 20
+
+
+def output_of(action):
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        action()
+    return buffer.getvalue().splitlines()
+
+
+class DecoratorCompatibilityTest(unittest.TestCase):
+    def setUp(self):
+        self.margherita = NewYorkFactory().get_pizza("Margherita")
+
+    def test_recursive_decorator_keeps_its_cost_and_description(self):
+        pizza = Cheese(Mushrooms(self.margherita))
+        self.assertEqual(pizza.get_cost(), 270)
+        self.assertEqual(pizza.get_description(), "New York Margherita, Mushrooms, Cheese")
+        self.assertEqual(Mushrooms(pizza).get_cost(), 290)
+
+    def test_recursive_decorator_between_flattened_layers(self):
+        pizza = Olives(Cheese(Mushrooms(Size(self.margherita, "Large"))))
+        self.assertEqual(pizza.get_cost(), 200 + 100 + 20 + 50 + 30)
+        self.assertEqual(pizza.get_description(), "New York Margherita (Large), Mushrooms, Cheese, Olives")
+        self.assertEqual(pizza.order_line().size, "large")
+
+    def test_prepare_and_bake_output_is_preserved(self):
+        pizza = Olives(Cheese(Mushrooms(self.margherita)))
+        self.assertEqual(output_of(pizza.prepare),
+                         ["Preparing Margherita pizza", "Adding Mushrooms", "Adding Cheese", "Adding Olives"])
+        self.assertEqual(output_of(pizza.bake), ["Baking Margherita pizza"])
+
+
+MENU = {
+    "pizzas": {"Margherita": 300},
+    "toppings": {"Cheese": 60, "Jalapenos": 45, "Olives": 35},
+    "sizes": {"Large": 150},
+    "styles": {"Roman": {"Margherita": "Roman Margherita"}},
+}
+
+
+class RegistryPriceTableTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = PizzaRegistry(PriceTable())
+        self.registry.load_menu(MENU)
+
+    def test_layers_use_the_base_pizza_price_table(self):
+        pizza = Olives(Cheese(Size(self.registry.factory("Roman").get_pizza("Margherita"), "Large")))
+        self.assertIs(pizza.prices, self.registry.prices)
+        self.assertEqual(pizza.get_cost(), 300 + 150 + 60 + 35)
+        self.assertEqual(NewYorkFactory().get_pizza("Margherita").prices, PRICES)
+
+    def test_reload_of_another_registry_reprices_cached_lines(self):
+        pizza = Cheese(self.registry.factory("Roman").get_pizza("Margherita"))
+        self.assertEqual(pizza.get_cost(), 360)
+        default_version = PRICES.version
+        self.registry.load_menu(dict(MENU, pizzas={"Margherita": 999}))
+        self.assertEqual(pizza.get_cost(), 1059)
+        self.assertEqual(PRICES.version, default_version)
+
+    def test_reload_swaps_one_immutable_snapshot(self):
+        before = self.registry.prices.current
+        self.registry.load_menu(dict(MENU, pizzas={"Margherita": 999}))
+        after = self.registry.prices.current
+        self.assertIsNot(before, after)
+        self.assertEqual((before.bases["margherita"], before.version + 1), (300, after.version))
+        self.assertEqual((after.bases["margherita"], after.toppings["cheese"]), (999, 60))
+        with self.assertRaises(AttributeError):
+            after.version = 0
+
+
+class BulkPricingPropertyTest(unittest.TestCase):
+    """Bulk totals must equal get_cost() for any chain the decorators can build."""
+    SIZES = ("Small", "medium", " LARGE ", "Family", "xl")  # the last two are not on the menu: priced as small
+    TOPPINGS = (Cheese, Jalapenos, Olives)
+
+    def random_pizza(self, rng, factories, kinds=("Margherita", "Farmhouse")):
+        pizza = rng.choice(factories).get_pizza(rng.choice(kinds))
+        layers = [rng.choice(self.TOPPINGS) for _ in range(rng.choice((0, 0, 1, rng.randint(2, 12))))]
+        if rng.random() < 0.7:
+            layers.insert(rng.randint(0, len(layers)), None)  # at most one Size layer, anywhere in the chain
+        for layer in layers:
+            pizza = Size(pizza, rng.choice(self.SIZES)) if layer is None else layer(pizza)
+        return pizza
+
+    def test_bulk_totals_match_get_cost_under_random_menus(self):
+        rng = random.Random(2024)
+        registry = PizzaRegistry(PriceTable())
+        for trial in range(150):
+            registry.load_menu({
+                "pizzas": {"Margherita": rng.randint(0, 999), "Farmhouse": rng.randint(0, 999)},
+                "toppings": {name.__name__: rng.randint(0, 99) for name in self.TOPPINGS},
+                "sizes": {"Small": rng.randint(0, 9), "Medium": rng.randint(0, 199), "Large": rng.randint(0, 199)},
+                "styles": {"New York": {"Margherita": "NY Margherita", "Farmhouse": "NY Farmhouse"},
+                           "Chicago": {"Margherita": "Chicago Margherita", "Farmhouse": "Chicago Farmhouse"}},
+            })
+            factories = [registry.factory("New York"), registry.factory("Chicago")]
+            pizzas = [self.random_pizza(rng, factories) for _ in range(40)]
+            pricer = BulkPricer(registry.prices)
+            with self.subTest(trial=trial):
+                self.assertEqual(list(pricer.price_pizzas(pizzas)), [pizza.get_cost() for pizza in pizzas])
+
+    def test_what_if_table_matches_a_reload(self):
+        rng = random.Random(7)
+        registry = PizzaRegistry(PriceTable())
+        registry.load_menu(MENU)
+        pizzas = [self.random_pizza(rng, [registry.factory("Roman")], kinds=("Margherita",)) for _ in range(50)]
+        pricer = BulkPricer(registry.prices)
+        encoded = pricer.encode(pizzas)
+        promotion = {"pizzas": {"Margherita": 250}, "toppings": {"Cheese": 1, "Jalapenos": 3, "Olives": 2},
+                     "sizes": {"Large": 99}}
+        what_if = PriceTable()
+        what_if.update(promotion["pizzas"], promotion["toppings"], promotion["sizes"])
+        totals = list(pricer.price(*encoded, prices=what_if))
+        registry.load_menu(dict(MENU, **promotion))
+        self.assertEqual(totals, [pizza.get_cost() for pizza in pizzas])
+
+    def test_classic_pizzas_and_bare_bases(self):
+        pizzas = [Margherita(), Farmhouse(), Size(Margherita(), "Family"), Cheese(Farmhouse())]
+        self.assertEqual(list(BulkPricer(PRICES).price_pizzas(pizzas)), [pizza.get_cost() for pizza in pizzas])
+
+
+if __name__ == "__main__":
+    unittest.main()